@@ -0,0 +1,213 @@
+# scaling benchmark for the robust decision criteria of notebook 02
+#
+# python test/benchmark_02_robust_decision_making.py --output bench_output.txt
+# python test/benchmark_02_robust_decision_making.py --baseline bench_output.txt
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from functools import partial
+from itertools import product
+from typing import Any, NamedTuple
+
+import numpy as np
+from test_02_robust_decision_making import (
+    is_gamma_maximin,
+    is_gamma_maximin_2,
+    is_hurwicz,
+    is_hurwicz_2,
+    is_interval_maximal,
+    is_interval_maximal_2,
+    is_interval_maximal_3,
+    is_interval_maximal_4,
+    is_interval_maximal_5,
+    is_rbayes_admissible,
+    is_rbayes_admissible_2,
+    is_rbayes_maximal,
+    is_rbayes_maximal_2,
+    is_rbayes_maximal_3,
+    is_rbayes_maximal_4,
+    random_problem,
+)
+
+Criterion = Callable[[Sequence[Sequence[float]], Sequence[Sequence[float]]], Any]
+
+
+class CriterionInfo(NamedTuple):
+    criterion: Criterion
+    is_quadratic: bool  # pure python pairwise comparisons
+    is_recursive: bool = False  # recursion depth grows with the number of gambles
+
+
+CRITERIA: dict[str, CriterionInfo] = {
+    "is_gamma_maximin": CriterionInfo(is_gamma_maximin, False),
+    "is_gamma_maximin_2": CriterionInfo(is_gamma_maximin_2, False),
+    "is_hurwicz": CriterionInfo(partial(is_hurwicz, 0.5), False),
+    "is_hurwicz_2": CriterionInfo(partial(is_hurwicz_2, 0.5), False),
+    "is_interval_maximal": CriterionInfo(is_interval_maximal, True),
+    "is_interval_maximal_2": CriterionInfo(is_interval_maximal_2, False),
+    "is_interval_maximal_3": CriterionInfo(is_interval_maximal_3, True, True),
+    "is_interval_maximal_4": CriterionInfo(is_interval_maximal_4, True),
+    "is_interval_maximal_5": CriterionInfo(is_interval_maximal_5, False),
+    "is_rbayes_maximal": CriterionInfo(is_rbayes_maximal, True),
+    "is_rbayes_maximal_2": CriterionInfo(is_rbayes_maximal_2, True, True),
+    "is_rbayes_maximal_3": CriterionInfo(is_rbayes_maximal_3, False),
+    "is_rbayes_maximal_4": CriterionInfo(is_rbayes_maximal_4, True),
+    "is_rbayes_admissible": CriterionInfo(is_rbayes_admissible, False),
+    "is_rbayes_admissible_2": CriterionInfo(is_rbayes_admissible_2, False),
+}
+
+
+class BenchmarkResult(NamedTuple):
+    criterion: str
+    num_gambles: int
+    num_pmfs: int
+    num_outcomes: int
+    seconds: float  # best wall time over all repetitions
+    peak_bytes: int  # peak memory allocated during a separate run
+
+
+def benchmark(
+    criterion: Criterion,
+    credal_set: Sequence[Sequence[float]],
+    gambles: Sequence[Sequence[float]],
+    repeat: int,
+) -> tuple[float, int]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        criterion(credal_set, gambles)
+        times.append(time.perf_counter() - start)
+    # tracing slows everything down, so memory is measured separately
+    tracemalloc.start()
+    try:
+        criterion(credal_set, gambles)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def run_grid(
+    criteria: Sequence[str],
+    gamble_counts: Sequence[int],
+    pmf_counts: Sequence[int],
+    outcome_counts: Sequence[int],
+    repeat: int = 3,
+    max_quadratic_gambles: int = 2000,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    results = []
+    for num_gambles, num_pmfs, num_outcomes in product(
+        gamble_counts, pmf_counts, outcome_counts
+    ):
+        problem = random_problem(seed, num_gambles, num_pmfs, num_outcomes)
+        credal_set = problem.credal_set.tolist()
+        gambles = problem.gambles.tolist()
+        for name in criteria:
+            info = CRITERIA[name]
+            if info.is_quadratic and num_gambles > max_quadratic_gambles:
+                continue
+            # leave plenty of room for the frames below the recursion
+            if info.is_recursive and num_gambles > sys.getrecursionlimit() // 2:
+                continue
+            seconds, peak_bytes = benchmark(info.criterion, credal_set, gambles, repeat)
+            results.append(
+                BenchmarkResult(
+                    name, num_gambles, num_pmfs, num_outcomes, seconds, peak_bytes
+                )
+            )
+    return results
+
+
+# results that are more than threshold times slower, or more memory hungry,
+# than the baseline; tiny differences are ignored as noise
+def regressions(
+    results: Sequence[BenchmarkResult],
+    baseline: Sequence[BenchmarkResult],
+    threshold: float = 1.5,
+    min_seconds: float = 1e-3,
+    min_bytes: int = 1 << 16,
+) -> list[str]:
+    base = {result[:4]: result for result in baseline}
+    messages = []
+    for result in results:
+        old = base.get(result[:4])
+        if old is None:
+            continue
+        key = "{} n={} k={} m={}".format(*result[:4])
+        if (
+            result.seconds > threshold * old.seconds
+            and result.seconds - old.seconds > min_seconds
+        ):
+            messages.append(f"{key}: {old.seconds:.4g}s -> {result.seconds:.4g}s")
+        if (
+            result.peak_bytes > threshold * old.peak_bytes
+            and result.peak_bytes - old.peak_bytes > min_bytes
+        ):
+            messages.append(
+                f"{key}: {old.peak_bytes} bytes -> {result.peak_bytes} bytes"
+            )
+    return messages
+
+
+def save_results(path: str, results: Sequence[BenchmarkResult]) -> None:
+    data = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": [result._asdict() for result in results],
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=1)
+
+
+def load_results(path: str) -> list[BenchmarkResult]:
+    with open(path) as file:
+        return [BenchmarkResult(**result) for result in json.load(file)["results"]]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="benchmark the robust decision criteria"
+    )
+    parser.add_argument(
+        "--criteria", nargs="+", choices=list(CRITERIA), default=list(CRITERIA)
+    )
+    parser.add_argument("--gambles", nargs="+", type=int, default=[100, 1000])
+    parser.add_argument("--pmfs", nargs="+", type=int, default=[2, 10])
+    parser.add_argument("--outcomes", nargs="+", type=int, default=[2, 5])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-quadratic-gambles", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_output.txt")
+    parser.add_argument("--baseline")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    args = parser.parse_args(argv)
+    results = run_grid(
+        criteria=args.criteria,
+        gamble_counts=args.gambles,
+        pmf_counts=args.pmfs,
+        outcome_counts=args.outcomes,
+        repeat=args.repeat,
+        max_quadratic_gambles=args.max_quadratic_gambles,
+        seed=args.seed,
+    )
+    for result in results:
+        print("{:22} n={:<7} k={:<4} m={:<4} {:10.6f}s {:12} bytes".format(*result))
+    if args.baseline is not None:
+        messages = regressions(results, load_results(args.baseline), args.threshold)
+        for message in messages:
+            print("regression:", message)
+    else:
+        messages = []
+    save_results(args.output, results)
+    return 1 if messages else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# differential test of the robust decision criteria of notebook 02
+#
+# python test/differential_02_robust_decision_making.py --problems 1000000
+
+import argparse
+import sys
+from collections.abc import Sequence
+
+from test_02_robust_decision_making import DIFFERENTIAL_CHECKS, differential_test
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="compare implementations of the robust decision criteria"
+    )
+    parser.add_argument("--problems", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-gambles", type=int, default=8)
+    parser.add_argument("--max-pmfs", type=int, default=4)
+    parser.add_argument("--max-outcomes", type=int, default=4)
+    parser.add_argument(
+        "--checks",
+        nargs="+",
+        choices=list(DIFFERENTIAL_CHECKS),
+        default=list(DIFFERENTIAL_CHECKS),
+    )
+    parser.add_argument("--max-mismatches", type=int, default=10)
+    args = parser.parse_args(argv)
+    mismatches = 0
+    for mismatch in differential_test(
+        num_problems=args.problems,
+        seed=args.seed,
+        max_gambles=args.max_gambles,
+        max_pmfs=args.max_pmfs,
+        max_outcomes=args.max_outcomes,
+        checks={name: DIFFERENTIAL_CHECKS[name] for name in args.checks},
+    ):
+        print(mismatch)
+        mismatches += 1
+        if mismatches >= args.max_mismatches:
+            break
+    print(f"{mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
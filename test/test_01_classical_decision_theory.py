@@ -1,14 +1,23 @@
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Hashable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
 from enum import Enum
+from functools import cache
+from typing import Any, NamedTuple
 
+import numpy as np
+import numpy.typing as npt
 import pytest
 
+TOL = 1e-6
 PMF = Sequence[float]
 Gamble = Sequence[float]
 Param = Enum("Param", ["LOW", "HIGH"])  # avg height in next hour
 Data = Enum("Data", ["LOW", "HIGH"])  # avg height from last hour
 Decision = Enum("Decision", ["BOAT", "NO_BOAT"])  # whether to send a boat
 Strategy = Callable[[Data], Decision]  # function from data to decision
+Array = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int_]
+BoolArray = npt.NDArray[np.bool_]
 
 
 def expectation(pmf: PMF, gamble: Gamble) -> float:
@@ -94,6 +103,203 @@ def test_wald(strategy: Strategy, result: Sequence[float]) -> None:
     assert [wald_expected_utility(strategy, x) for x in Param] == pytest.approx(result)
 
 
+# strategies are numbered in base num_decisions, least significant digit first:
+# row s gives, for every data index y, the index of the decision taken by strategy s
+def strategy_table_chunk(
+    num_decisions: int,
+    num_data: int,
+    start: int,
+    stop: int,
+) -> IntArray:
+    if stop - 1 > np.iinfo(np.int64).max:
+        raise ValueError("strategy index out of range")
+    # digits by repeated division, as num_decisions ** num_data may overflow
+    codes = np.arange(start, stop, dtype=np.int64)
+    result = np.empty((len(codes), num_data), dtype=int)
+    for y in range(num_data):
+        codes, result[:, y] = np.divmod(codes, num_decisions)
+    return result
+
+
+def strategy_table(num_decisions: int, num_data: int) -> IntArray:
+    return strategy_table_chunk(num_decisions, num_data, 0, num_decisions**num_data)
+
+
+def test_strategy_table() -> None:
+    assert strategy_table(2, 2).tolist() == [[0, 0], [1, 0], [0, 1], [1, 1]]
+    assert strategy_table(3, 2)[5].tolist() == [2, 1]
+    assert strategy_table_chunk(3, 4, 10, 12).tolist() == [[1, 0, 1, 0], [2, 0, 1, 0]]
+    # far more strategies than fit in an int64
+    assert strategy_table_chunk(10, 25, 0, 3).tolist() == [
+        [0] * 25,
+        [1] + [0] * 24,
+        [2] + [0] * 24,
+    ]
+    assert strategy_table_chunk(2, 64, 1, 3).tolist() == [
+        [1] + [0] * 63,
+        [0, 1] + [0] * 62,
+    ]
+    last = np.iinfo(np.int64).max
+    assert strategy_table_chunk(2, 64, last, last + 1).tolist() == [[1] * 63 + [0]]
+    with pytest.raises(ValueError, match="out of range"):
+        strategy_table_chunk(2, 64, last, last + 2)
+
+
+def wald_expected_utility_table(
+    utility_table: Array,  # utility_table[d, x]
+    likelihood_table: Array,  # likelihood_table[y, x]
+    strategies: IntArray,  # strategies[s, y]
+) -> Array:
+    # result[s, x] is the wald expected utility of strategy s given parameter x
+    result = np.zeros((len(strategies), utility_table.shape[1]))
+    for y, likelihoods in enumerate(likelihood_table):
+        result += utility_table[strategies[:, y]] * likelihoods
+    return result
+
+
+def wald_expected_utility_chunks(
+    utility_table: Array,
+    likelihood_table: Array,
+    chunk_size: int,
+) -> Iterator[tuple[IntArray, Array]]:
+    # yields strategy indices along with their wald expected utilities
+    num_decisions, num_data = len(utility_table), len(likelihood_table)
+    num_strategies = num_decisions**num_data
+    for start in range(0, num_strategies, chunk_size):
+        stop = min(start + chunk_size, num_strategies)
+        strategies = strategy_table_chunk(num_decisions, num_data, start, stop)
+        yield np.arange(start, stop), wald_expected_utility_table(
+            utility_table, likelihood_table, strategies
+        )
+
+
+# check weak dominance between all rows of xss and all rows of yss
+def wald_dominates_table(xss: Array, yss: Array) -> BoolArray:
+    xss3, yss3 = xss[:, np.newaxis, :], yss[np.newaxis, :, :]
+    return np.all(xss3 + TOL >= yss3, axis=2) & np.any(xss3 > yss3 + TOL, axis=2)
+
+
+def wald_admissible_strategies(
+    utility_table: Array,
+    likelihood_table: Array,
+    chunk_size: int = 1024,
+) -> IntArray:
+    indices = np.zeros(0, dtype=int)
+    values = np.zeros((0, utility_table.shape[1]))
+    for chunk_indices, chunk_values in wald_expected_utility_chunks(
+        utility_table, likelihood_table, chunk_size
+    ):
+        is_chunk_dominated = wald_dominates_table(values, chunk_values).any(
+            axis=0
+        ) | wald_dominates_table(chunk_values, chunk_values).any(axis=0)
+        is_dominated = wald_dominates_table(chunk_values, values).any(axis=0)
+        indices = np.concatenate(
+            [indices[~is_dominated], chunk_indices[~is_chunk_dominated]]
+        )
+        values = np.concatenate(
+            [values[~is_dominated], chunk_values[~is_chunk_dominated]]
+        )
+    # dominance within TOL is not transitive, so a survivor can still be
+    # dominated by a strategy that was dropped before it was seen
+    is_dominated = np.zeros(len(indices), dtype=bool)
+    for _, chunk_values in wald_expected_utility_chunks(
+        utility_table, likelihood_table, chunk_size
+    ):
+        is_dominated |= wald_dominates_table(chunk_values, values).any(axis=0)
+    return np.sort(indices[~is_dominated])
+
+
+def wald_minimax_strategies(
+    utility_table: Array,
+    likelihood_table: Array,
+    chunk_size: int = 1024,
+) -> IntArray:
+    max_min = -np.inf
+    indices = np.zeros(0, dtype=int)
+    mins = np.zeros(0)
+    for chunk_indices, chunk_values in wald_expected_utility_chunks(
+        utility_table, likelihood_table, chunk_size
+    ):
+        chunk_mins = chunk_values.min(axis=1)
+        max_min = max(max_min, chunk_mins.max())
+        indices = np.concatenate([indices, chunk_indices])
+        mins = np.concatenate([mins, chunk_mins])
+        is_optimal = mins + TOL >= max_min
+        indices, mins = indices[is_optimal], mins[is_optimal]
+    return indices
+
+
+def test_wald_expected_utility_table() -> None:
+    utility_table = np.array([[utility(d, x) for x in Param] for d in Decision])
+    likelihood_table = np.array([[likelihood(y, x) for x in Param] for y in Data])
+    strategies = strategy_table(len(Decision), len(Data))
+    assert wald_expected_utility_table(
+        utility_table, likelihood_table, strategies
+    ).tolist() == [
+        pytest.approx([wald_expected_utility(strategy, x) for x in Param])
+        for strategy in [
+            strategy_boat,
+            strategy_boat_if_high,
+            strategy_boat_if_low,
+            strategy_no_boat,
+        ]
+    ]
+    for chunk_size in [1, 3, 1024]:
+        assert wald_admissible_strategies(
+            utility_table, likelihood_table, chunk_size
+        ).tolist() == [0, 2, 3]
+        assert wald_minimax_strategies(
+            utility_table, likelihood_table, chunk_size
+        ).tolist() == [3]
+
+
+def test_wald_admissible_strategies_not_transitive() -> None:
+    # a dominates b, and b dominates c, but a does not dominate c
+    utility_table = np.array([[4, -1.8], [2, -0.9], [0, 0]]) * TOL
+    likelihood_table = np.array([[1.0, 1.0]])
+    for chunk_size in [1, 2, 3]:
+        assert wald_admissible_strategies(
+            utility_table, likelihood_table, chunk_size
+        ).tolist() == [0]
+
+
+def test_wald_expected_utility_table_chunks() -> None:
+    rng = np.random.default_rng(0)
+    utility_table = rng.integers(-3, 4, size=(3, 4)).astype(float)
+    likelihood_table = rng.dirichlet(np.ones(5), size=4).T
+    strategies = strategy_table(3, 5)
+    values = wald_expected_utility_table(utility_table, likelihood_table, strategies)
+    for s in [0, 17, 242]:
+        assert values[s] == pytest.approx(
+            [
+                sum(
+                    likelihood_table[y, x] * utility_table[strategies[s, y], x]
+                    for y in range(5)
+                )
+                for x in range(4)
+            ]
+        )
+    admissible = [
+        s
+        for s in range(len(values))
+        if not wald_dominates_table(values, values[s : s + 1]).any()
+    ]
+    minimax = np.flatnonzero(values.min(axis=1) + TOL >= values.min(axis=1).max())
+    for chunk_size in [1, 7, 100, 1024]:
+        assert (
+            wald_admissible_strategies(
+                utility_table, likelihood_table, chunk_size
+            ).tolist()
+            == admissible
+        )
+        assert (
+            wald_minimax_strategies(
+                utility_table, likelihood_table, chunk_size
+            ).tolist()
+            == minimax.tolist()
+        )
+
+
 def posterior(x: Param, y: Data) -> float:
     return (
         likelihood(y, x) * prior(x) / sum(likelihood(y, x_) * prior(x_) for x_ in Param)
@@ -113,3 +319,433 @@ def test_bayes() -> None:
         -15 / 23
     )
     assert posterior_expected_utility(Decision.NO_BOAT, Data.HIGH) == pytest.approx(0)
+
+
+def posterior_table(
+    prior_table: Array,  # prior_table[x]
+    likelihood_table: Array,  # likelihood_table[y, x]
+) -> Array:
+    # result[y, x] is the posterior of x given y
+    joint = likelihood_table * prior_table
+    evidence = joint.sum(axis=1, keepdims=True)  # computed once for every y
+    return np.divide(joint, evidence, out=np.zeros_like(joint), where=evidence > 0)
+
+
+def test_posterior_table() -> None:
+    prior_table = np.array([prior(x) for x in Param])
+    likelihood_table = np.array([[likelihood(y, x) for x in Param] for y in Data])
+    assert posterior_table(prior_table, likelihood_table).tolist() == [
+        pytest.approx([posterior(x, y) for x in Param]) for y in Data
+    ]
+
+
+class BayesStrategy(NamedTuple):
+    strategy: IntArray  # strategy[y] is the index of the optimal decision given y
+    expected_utility: float  # prior expected utility of the strategy
+
+
+def bayes_strategy(
+    prior_table: Array,  # prior_table[x]
+    likelihood_table: Array,  # likelihood_table[y, x]
+    utility_table: Array,  # utility_table[d, x]
+) -> BayesStrategy:
+    # values[d, y] is the posterior expected utility of d given y, times the
+    # evidence of y; maximising this over d for each y separately avoids
+    # enumerating all strategies
+    values = utility_table @ (likelihood_table * prior_table).T
+    return BayesStrategy(
+        strategy=values.argmax(axis=0),
+        expected_utility=float(values.max(axis=0).sum()),
+    )
+
+
+def test_bayes_strategy() -> None:
+    prior_table = np.array([prior(x) for x in Param])
+    likelihood_table = np.array([[likelihood(y, x) for x in Param] for y in Data])
+    utility_table = np.array([[utility(d, x) for x in Param] for d in Decision])
+    solution = bayes_strategy(prior_table, likelihood_table, utility_table)
+    assert solution.strategy.tolist() == [0, 1]  # boat if low
+    assert solution.expected_utility == pytest.approx(
+        sum(wald_expected_utility(strategy_boat_if_low, x) * prior(x) for x in Param)
+    )
+
+
+def test_bayes_strategy_normal_form() -> None:
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        prior_table = rng.dirichlet(np.ones(4))
+        likelihood_table = rng.dirichlet(np.ones(3), size=4).T
+        utility_table = rng.normal(size=(3, 4))
+        solution = bayes_strategy(prior_table, likelihood_table, utility_table)
+        strategies = strategy_table(3, 3)
+        values = (
+            wald_expected_utility_table(utility_table, likelihood_table, strategies)
+            @ prior_table
+        )
+        assert solution.expected_utility == pytest.approx(values.max())
+        assert solution.strategy.tolist() == strategies[values.argmax()].tolist()
+
+
+# position of every member of an enum, in definition order
+@cache
+def ordinals(enum: type[Enum]) -> Mapping[Enum, int]:
+    return {member: i for i, member in enumerate(enum)}
+
+
+def ordinal(member: Enum) -> int:
+    return ordinals(type(member))[member]
+
+
+@dataclass
+class DecisionTables:
+    params: type[Enum]
+    data: type[Enum]
+    decisions: type[Enum]
+    utility: Array  # utility[d, x]
+    likelihood: Array  # likelihood[y, x]
+    prior: Array  # prior[x]
+    posterior: Array  # posterior[y, x]
+
+
+def tabulate(
+    params: type[Enum],
+    data: type[Enum],
+    decisions: type[Enum],
+    utility: Callable[[Any, Any], float],  # (decision, param) -> utility
+    likelihood: Callable[[Any, Any], float],  # (data, param) -> probability
+    prior: Callable[[Any], float],  # param -> probability
+) -> DecisionTables:
+    prior_table = np.array([prior(x) for x in params], dtype=float)
+    likelihood_table = np.array(
+        [[likelihood(y, x) for x in params] for y in data], dtype=float
+    )
+    return DecisionTables(
+        params=params,
+        data=data,
+        decisions=decisions,
+        utility=np.array([[utility(d, x) for x in params] for d in decisions], float),
+        likelihood=likelihood_table,
+        prior=prior_table,
+        posterior=posterior_table(prior_table, likelihood_table),
+    )
+
+
+boat_tables = tabulate(Param, Data, Decision, utility, likelihood, prior)
+
+
+# row of the strategy table that corresponds to the given strategy
+def strategy_codes(tables: DecisionTables, strategy: Callable[[Any], Enum]) -> IntArray:
+    return np.array([ordinal(strategy(y)) for y in tables.data])
+
+
+def tabulated_wald_expected_utility(
+    tables: DecisionTables, strategy: Callable[[Any], Enum], x: Enum
+) -> float:
+    i = ordinal(x)
+    return float(
+        tables.likelihood[:, i] @ tables.utility[strategy_codes(tables, strategy), i]
+    )
+
+
+def tabulated_posterior(tables: DecisionTables, x: Enum, y: Enum) -> float:
+    return float(tables.posterior[ordinal(y), ordinal(x)])
+
+
+def tabulated_posterior_expected_utility(
+    tables: DecisionTables, d: Enum, y: Enum
+) -> float:
+    return float(tables.utility[ordinal(d)] @ tables.posterior[ordinal(y)])
+
+
+def test_tabulate() -> None:
+    assert boat_tables.utility.tolist() == [[3, -1], [0, 0]]
+    assert boat_tables.likelihood.tolist() == [[0.9, 0.3], [0.1, 0.7]]
+    assert boat_tables.prior.tolist() == [0.4, 0.6]
+    assert boat_tables.utility.flags.c_contiguous
+    assert ordinal(Param.HIGH) == 1
+    assert strategy_codes(boat_tables, strategy_boat_if_low).tolist() == [0, 1]
+    for strategy in strategies:
+        for x in Param:
+            assert tabulated_wald_expected_utility(
+                boat_tables, strategy, x
+            ) == pytest.approx(wald_expected_utility(strategy, x))
+    for y in Data:
+        for x in Param:
+            assert tabulated_posterior(boat_tables, x, y) == pytest.approx(
+                posterior(x, y)
+            )
+        for d in Decision:
+            assert tabulated_posterior_expected_utility(
+                boat_tables, d, y
+            ) == pytest.approx(posterior_expected_utility(d, y))
+    assert (
+        bayes_strategy(
+            boat_tables.prior, boat_tables.likelihood, boat_tables.utility
+        ).strategy.tolist()
+        == strategy_codes(boat_tables, strategy_boat_if_low).tolist()
+    )
+
+
+def test_tabulate_large() -> None:
+    params = Enum("params", [f"X{i}" for i in range(300)])  # type: ignore[misc]
+    size = len(params)
+
+    def utility_(d: Decision, x: Enum) -> float:
+        return ordinal(x) / size if d == Decision.BOAT else 0.25
+
+    def likelihood_(y: Data, x: Enum) -> float:
+        return (
+            ordinal(x) / (size - 1) if y == Data.HIGH else 1 - ordinal(x) / (size - 1)
+        )
+
+    def prior_(x: Enum) -> float:
+        return 1 / size
+
+    tables = tabulate(params, Data, Decision, utility_, likelihood_, prior_)
+    assert tables.posterior.sum(axis=1) == pytest.approx([1, 1])
+    x = list(params)[123]
+    assert tabulated_wald_expected_utility(
+        tables, strategy_boat_if_high, x
+    ) == pytest.approx(
+        likelihood_(Data.HIGH, x) * utility_(Decision.BOAT, x)
+        + likelihood_(Data.LOW, x) * utility_(Decision.NO_BOAT, x)
+    )
+
+
+@dataclass(eq=False)
+class LeafNode:
+    utility: float
+
+
+@dataclass(eq=False)
+class ChanceNode:
+    credal_set: Sequence[PMF]  # use a single pmf for precise probabilities
+    children: Sequence["Node"]
+
+
+@dataclass(eq=False)
+class DecisionNode:
+    children: Sequence["Node"]
+
+
+Node = LeafNode | ChanceNode | DecisionNode
+
+
+class TreeSolution(NamedTuple):
+    value: float
+    choices: Mapping[DecisionNode, Sequence[bool]]  # optimal children of each node
+    num_subtrees: int  # number of structurally distinct subtrees that were solved
+
+
+# backward induction, solving every structurally distinct subtree only once
+def solve_tree(
+    tree: Node,
+    # combines the expectations at a chance node, for instance min for
+    # gamma-maximin, max for gamma-maximax, or a hurwicz combination
+    transform: Callable[[Sequence[float]], float] = min,
+) -> TreeSolution:
+    subtree_ids: dict[int, int] = {}  # node identity -> structural subtree id
+    keys: dict[Hashable, int] = {}  # structural key -> structural subtree id
+    values: list[float] = []
+    subtree_choices: list[Sequence[bool]] = []
+    choices: dict[DecisionNode, Sequence[bool]] = {}
+    stack: list[tuple[Node, bool]] = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in subtree_ids:
+            continue
+        if not expanded and not isinstance(node, LeafNode):
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children)
+            continue
+        key: Hashable
+        if isinstance(node, LeafNode):
+            key = ("leaf", node.utility)
+        else:
+            child_ids = tuple(subtree_ids[id(child)] for child in node.children)
+            xs = [values[i] for i in child_ids]
+            if isinstance(node, ChanceNode):
+                key = ("chance", tuple(map(tuple, node.credal_set)), child_ids)
+            else:
+                key = ("decision", child_ids)
+        if key not in keys:
+            keys[key] = len(values)
+            if isinstance(node, LeafNode):
+                values.append(node.utility)
+                subtree_choices.append([])
+            elif isinstance(node, ChanceNode):
+                values.append(
+                    transform([expectation(pmf, xs) for pmf in node.credal_set])
+                )
+                subtree_choices.append([])
+            else:
+                max_x = max(xs)
+                values.append(max_x)
+                subtree_choices.append([x + TOL >= max_x for x in xs])
+        subtree_ids[id(node)] = keys[key]
+        if isinstance(node, DecisionNode):
+            choices[node] = subtree_choices[keys[key]]
+    return TreeSolution(
+        value=values[subtree_ids[id(tree)]], choices=choices, num_subtrees=len(values)
+    )
+
+
+# observe the data, then decide, at the given cost for observing
+def boat_data_tree(cost: float) -> ChanceNode:
+    evidence = [sum(likelihood(y, x) * prior(x) for x in Param) for y in Data]
+    return ChanceNode(
+        credal_set=[evidence],
+        children=[
+            DecisionNode(
+                [
+                    ChanceNode(
+                        [[posterior(x, y) for x in Param]],
+                        [LeafNode(utility(d, x) - cost) for x in Param],
+                    )
+                    for d in Decision
+                ]
+            )
+            for y in Data
+        ],
+    )
+
+
+# decide straight away, or first observe the data at the given cost
+def boat_tree(cost: float) -> DecisionNode:
+    return DecisionNode(
+        [
+            DecisionNode(
+                [
+                    ChanceNode(
+                        [[prior(x) for x in Param]],
+                        [LeafNode(utility(d, x)) for x in Param],
+                    )
+                    for d in Decision
+                ]
+            ),
+            boat_data_tree(cost),
+        ]
+    )
+
+
+def test_solve_tree() -> None:
+    data_tree = boat_data_tree(cost=0)
+    solution = solve_tree(data_tree)
+    assert solution.value == pytest.approx(
+        sum(wald_expected_utility(strategy_boat_if_low, x) * prior(x) for x in Param)
+    )
+    assert [
+        solution.choices[node]
+        for node in data_tree.children
+        if isinstance(node, DecisionNode)
+    ] == [
+        [True, False],
+        [False, True],
+    ]
+    tree = boat_tree(cost=0.2)
+    solution = solve_tree(tree)
+    assert solution.value == pytest.approx(0.7)
+    assert solution.choices[tree] == [False, True]
+    tree = boat_tree(cost=0.4)
+    solution = solve_tree(tree)
+    assert solution.value == pytest.approx(0.6)
+    assert solution.choices[tree] == [True, False]
+
+
+def test_solve_tree_robust() -> None:
+    credal_set = [[0.5, 0.5], [0.8, 0.2]]
+    tree = DecisionNode(
+        [
+            ChanceNode(credal_set, [LeafNode(440), LeafNode(260)]),
+            ChanceNode(credal_set, [LeafNode(420), LeafNode(300)]),
+            ChanceNode(credal_set, [LeafNode(370), LeafNode(370)]),
+        ]
+    )
+    assert solve_tree(tree, min).choices[tree] == [False, False, True]
+    assert solve_tree(tree, max).choices[tree] == [True, False, False]
+    assert solve_tree(tree, lambda xs: 0.5 * min(xs) + 0.5 * max(xs)).choices[tree] == [
+        False,
+        True,
+        False,
+    ]
+
+
+def test_solve_tree_memoize() -> None:
+    # identical subtrees built as separate objects
+    def build(depth: int) -> Node:
+        if depth == 0:
+            return LeafNode(1)
+        return DecisionNode(
+            [
+                ChanceNode([[0.5, 0.5]], [build(depth - 1), build(depth - 1)]),
+                LeafNode(0),
+            ]
+        )
+
+    solution = solve_tree(build(12))
+    assert solution.value == pytest.approx(1)
+    assert solution.num_subtrees == 2 * 12 + 2
+    # a leaf and a decision node must not be mistaken for one another
+    tree = DecisionNode([DecisionNode([LeafNode(5)]), LeafNode(1)])
+    assert solve_tree(tree).value == pytest.approx(5)
+    # long chain of shared subtrees, deeper than the recursion limit
+    node: Node = LeafNode(1)
+    for _ in range(5000):
+        chance = ChanceNode([[0.5, 0.5]], [node, node])
+        node = DecisionNode([chance, LeafNode(0)])
+    assert solve_tree(node).value == pytest.approx(1)
+
+
+class ValueOfInformation(NamedTuple):
+    perfect: float  # expected value of perfect information
+    sample: Array  # expected value of sample information, for every experiment
+
+
+# experiments with fewer data outcomes can be padded with rows of zeros
+def value_of_information(
+    prior_table: Array,  # prior_table[x]
+    likelihood_tables: Array,  # likelihood_tables[e, y, x] for experiment e
+    utility_table: Array,  # utility_table[d, x]
+) -> ValueOfInformation:
+    prior_value = (utility_table @ prior_table).max()
+    perfect_value = prior_table @ utility_table.max(axis=0)
+    # values[e, y, d] as in bayes_strategy, for all experiments in one product
+    values = likelihood_tables @ (utility_table * prior_table).T
+    return ValueOfInformation(
+        perfect=float(perfect_value - prior_value),
+        sample=values.max(axis=2).sum(axis=1) - prior_value,
+    )
+
+
+def test_value_of_information() -> None:
+    likelihood_tables = np.array(
+        [
+            boat_tables.likelihood,
+            [[0.5, 0.5], [0.5, 0.5]],  # uninformative
+            [[1, 0], [0, 1]],  # perfect
+        ]
+    )
+    voi = value_of_information(
+        boat_tables.prior, likelihood_tables, boat_tables.utility
+    )
+    assert voi.perfect == pytest.approx(0.6)
+    assert voi.sample == pytest.approx([0.3, 0, 0.6])
+
+
+def test_value_of_information_bayes() -> None:
+    rng = np.random.default_rng(2)
+    prior_table = rng.dirichlet(np.ones(4))
+    likelihood_tables = rng.dirichlet(np.ones(5), size=(50, 4)).transpose(0, 2, 1)
+    utility_table = rng.normal(size=(3, 4))
+    prior_value = max(utility_table @ prior_table)
+    assert value_of_information(
+        prior_table, likelihood_tables, utility_table
+    ).sample == pytest.approx(
+        [
+            bayes_strategy(
+                prior_table, likelihood_table, utility_table
+            ).expected_utility
+            - prior_value
+            for likelihood_table in likelihood_tables
+        ]
+    )
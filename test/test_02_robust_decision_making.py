@@ -1,10 +1,69 @@
-from collections.abc import Callable, Sequence
-
+import hashlib
+import os
+import tracemalloc
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import cached_property, partial
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple, Protocol, TypeGuard, Union
+
+import numpy as np
+import numpy.typing as npt
 import pytest
 
+try:
+    from scipy import sparse  # type: ignore[import-untyped]
+    from scipy.optimize import linprog  # type: ignore[import-untyped]
+except ImportError:  # use the simplex method below, and dense matrices only
+    linprog = None
+    sparse = None
+
 TOL = 1e-6
 PMF = Sequence[float]
 Gamble = Sequence[float]
+Array = npt.NDArray[np.float64]
+BoolArray = npt.NDArray[np.bool_]
+IntArray = npt.NDArray[np.int_]
+# float64 or float32, possibly memory-mapped
+FloatArray = npt.NDArray[np.floating[Any]]
+
+
+# the part of the scipy.sparse matrix and array interface that is used here;
+# scipy has no type annotations, so this lets mypy check the sparse code paths
+class SparseMatrix(Protocol):
+    @property
+    def shape(self) -> tuple[int, int]: ...
+
+    @property
+    def T(self) -> "SparseMatrix": ...
+
+    def __getitem__(self, key: Any) -> Any: ...
+
+    def __neg__(self) -> "SparseMatrix": ...
+
+    def __matmul__(self, other: Any) -> Any: ...
+
+    def __rmatmul__(self, other: Any) -> Any: ...
+
+    def toarray(self) -> Array: ...
+
+
+# one gamble per row
+Gambles = Union[Sequence[Gamble], FloatArray, SparseMatrix]
+# a finite sequence of pmfs, or a credal set specified by constraints
+CredalSet = Union[
+    Sequence[PMF],
+    FloatArray,
+    SparseMatrix,
+    "ConstraintCredalSet",
+    "ProbabilityIntervals",
+    "LinearVacuous",
+    "PBox",
+    "JointCredalSet",
+]
 
 
 def expectation(pmf: PMF, gamble: Gamble) -> float:
@@ -21,6 +80,103 @@ def test_expectation() -> None:
     ]
 
 
+def is_sparse(matrix: object) -> TypeGuard[SparseMatrix]:
+    return sparse is not None and bool(sparse.issparse(matrix))
+
+
+# sparse matrices are kept as they are, everything else becomes an array
+def as_matrix(matrix: npt.ArrayLike | SparseMatrix) -> Array | SparseMatrix:
+    return matrix if is_sparse(matrix) else np.asarray(matrix, dtype=float)
+
+
+def dense_matrix(matrix: npt.ArrayLike | SparseMatrix) -> Array:
+    result: Any = as_matrix(matrix)
+    return np.asarray(result.toarray() if is_sparse(result) else result)
+
+
+# constraint matrix with n columns, possibly without any rows
+def constraint_rows(
+    matrix: npt.ArrayLike | SparseMatrix | None, n: int
+) -> Array | SparseMatrix:
+    if is_sparse(matrix):
+        return matrix
+    return np.asarray([] if matrix is None else matrix, dtype=float).reshape(-1, n)
+
+
+# the rows of all matrices, in a sparse matrix if any of them is sparse
+def stack_rows(matrices: Sequence[Array | SparseMatrix]) -> Array | SparseMatrix:
+    if any(is_sparse(matrix) for matrix in matrices):
+        return sparse.vstack(matrices, format="csr")
+    return np.vstack([dense_matrix(matrix) for matrix in matrices])
+
+
+# row indices, column indices, and values of the non-zero entries of a matrix
+def matrix_entries(matrix: Array | SparseMatrix) -> tuple[IntArray, IntArray, Array]:
+    if is_sparse(matrix):
+        entries: Any = sparse.coo_array(matrix)
+        return entries.row, entries.col, entries.data
+    dense = dense_matrix(matrix)
+    rows, columns = np.nonzero(dense)
+    return rows, columns, dense[rows, columns]
+
+
+# matrix from the row indices, column indices, and values of its non-zero
+# entries; sparse if scipy is installed, as the simplex method is dense anyway
+def entries_matrix(
+    shape: tuple[int, int],
+    rows: IntArray,
+    columns: IntArray,
+    values: Array,
+) -> Array | SparseMatrix:
+    if sparse is not None:
+        return sparse.csr_array((values, (rows, columns)), shape=shape)
+    result = np.zeros(shape)
+    np.add.at(result, (rows, columns), values)
+    return result
+
+
+# sparse matrix from index/value pairs, one pair for every row
+def sparse_matrix(
+    num_columns: int,
+    rows: Sequence[tuple[Sequence[int], Sequence[float]]],
+) -> SparseMatrix:
+    indptr = np.cumsum([0] + [len(indices) for indices, _ in rows])
+    indices = np.concatenate([np.asarray(i, dtype=int) for i, _ in rows] + [[]])
+    values = np.concatenate([np.asarray(v, dtype=float) for _, v in rows] + [[]])
+    return sparse.csr_array(
+        (values, indices.astype(int), indptr), shape=(len(rows), num_columns)
+    )
+
+
+# all expectations in a single matrix product:
+# result[i, j] is the expectation of gambles[i] with respect to credal_set[j]
+def expectation_matrix(
+    credal_set: npt.ArrayLike | SparseMatrix,
+    gambles: npt.ArrayLike | SparseMatrix,
+) -> Array:
+    if is_sparse(gambles) or is_sparse(credal_set):
+        # only the non-zero entries are multiplied
+        return dense_matrix(as_matrix(gambles) @ as_matrix(credal_set).T)
+    return np.asarray(gambles, dtype=float) @ np.asarray(credal_set, dtype=float).T
+
+
+def test_expectation_matrix() -> None:
+    credal_set = [[0.5, 0.5], [0.8, 0.2], [0.65, 0.35]]
+    gambles = [[440, 260], [420, 300], [370, 370]]
+    assert expectation_matrix(credal_set, gambles).tolist() == [
+        pytest.approx([350, 404, 377]),
+        pytest.approx([360, 396, 378]),
+        pytest.approx([370, 370, 370]),
+    ]
+    rng = np.random.default_rng(0)
+    credal_set2 = rng.dirichlet(np.ones(7), size=5).tolist()
+    gambles2 = rng.normal(size=(30, 7)).tolist()
+    assert expectation_matrix(credal_set2, gambles2).tolist() == [
+        pytest.approx([expectation(pmf, gamble) for pmf in credal_set2])
+        for gamble in gambles2
+    ]
+
+
 def transform_expectations(
     transform: Callable[[Sequence[float]], float],  # sequence of expectations -> float
     credal_set: Sequence[PMF],
@@ -37,6 +193,102 @@ def upper_expectation(credal_set: Sequence[PMF], gamble: Gamble) -> float:
     return transform_expectations(max, credal_set, gamble)
 
 
+# lower and upper expectations of many gambles at once
+def lower_expectations(
+    credal_set: CredalSet,
+    gambles: Gambles,
+    cache: "ExpectationCache | None" = None,
+) -> Array:
+    if cache is not None:
+        return cached_lower_expectations(cache, credal_set, gambles)
+    if isinstance(credal_set, ConstraintCredalSet):
+        return constraint_lower_expectations(credal_set, gambles)
+    if isinstance(credal_set, ProbabilityIntervals):
+        return intervals_lower_expectations(credal_set, gambles)
+    if isinstance(credal_set, LinearVacuous):
+        return linear_vacuous_lower_expectations(credal_set, gambles)
+    if isinstance(credal_set, PBox):
+        return pbox_lower_expectations(credal_set, gambles)
+    if isinstance(credal_set, JointCredalSet):
+        return joint_lower_expectations(credal_set, gambles)
+    return expectation_matrix(credal_set, gambles).min(axis=1)
+
+
+def upper_expectations(
+    credal_set: CredalSet,
+    gambles: Gambles,
+    cache: "ExpectationCache | None" = None,
+) -> Array:
+    if cache is not None or isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        # conjugacy: the upper expectation of x is minus the lower one of -x
+        negated = -as_matrix(gambles)
+        return -lower_expectations(credal_set, negated, cache)
+    return expectation_matrix(credal_set, gambles).max(axis=1)
+
+
+class ExpectationBounds(NamedTuple):
+    lower: Array
+    upper: Array
+
+    def hurwicz(self, beta: float) -> Array:
+        return beta * self.lower + (1 - beta) * self.upper
+
+
+# lower and upper expectations from a single evaluation
+def lower_upper_expectations(
+    credal_set: CredalSet,
+    gambles: Gambles,
+    cache: "ExpectationCache | None" = None,
+) -> ExpectationBounds:
+    if cache is not None or isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        # conjugacy, with the gambles and their negations in one batch
+        xss = as_matrix(gambles)
+        both = (
+            sparse.vstack([xss, -xss])
+            if is_sparse(xss)
+            else np.concatenate([xss, -xss])
+        )
+        values = lower_expectations(credal_set, both, cache)
+        n = xss.shape[0]
+        return ExpectationBounds(lower=values[:n], upper=-values[n:])
+    ess = expectation_matrix(credal_set, gambles)
+    return ExpectationBounds(lower=ess.min(axis=1), upper=ess.max(axis=1))
+
+
+def test_lower_upper_expectations(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = np.random.default_rng(0)
+    pmfs = rng.dirichlet(np.ones(3), size=4)
+    gambles = rng.normal(size=(20, 3))
+    credal_sets: list[CredalSet] = [
+        pmfs.tolist(),
+        LinearVacuous(pmf=pmfs[0].tolist(), epsilon=0.2),
+        ConstraintCredalSet(a=np.eye(3).tolist(), b=[0.1, 0.2, 0.3]),
+    ]
+    for credal_set in credal_sets:
+        bounds = lower_upper_expectations(credal_set, gambles.tolist())
+        assert bounds.lower == pytest.approx(lower_expectations(credal_set, gambles))
+        assert bounds.upper == pytest.approx(upper_expectations(credal_set, gambles))
+        assert bounds.hurwicz(0.3) == pytest.approx(
+            0.3 * lower_expectations(credal_set, gambles)
+            + 0.7 * upper_expectations(credal_set, gambles)
+        )
+    assert lower_upper_expectations(pmfs, gambles).hurwicz(0.3) == pytest.approx(
+        [hurwicz_expectation(0.3, pmfs.tolist(), gamble) for gamble in gambles]
+    )
+    # one expectation matrix for all bounds, and for the hurwicz criterion
+    calls = []
+    original = expectation_matrix
+
+    def counting_expectation_matrix(credal_set: Any, gambles: Any) -> Array:
+        calls.append(1)
+        return original(credal_set, gambles)
+
+    monkeypatch.setitem(globals(), "expectation_matrix", counting_expectation_matrix)
+    is_hurwicz_2(0.5, pmfs.tolist(), gambles.tolist())
+    is_interval_maximal_5(pmfs.tolist(), gambles.tolist())
+    assert len(calls) == 2
+
+
 def test_lower_upper_expectation() -> None:
     assert lower_expectation(
         credal_set=[[0.2, 0.2, 0.6], [0.1, 0.1, 0.8]],
@@ -56,6 +308,153 @@ def test_lower_upper_expectation() -> None:
     ) == pytest.approx(-2.2)
 
 
+# digest of the values of gambles, pmfs, and credal sets
+def content_hash(value: object) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    if is_dataclass(value):
+        digest.update(type(value).__name__.encode())
+        for item in fields(value):
+            digest.update(content_hash(getattr(value, item.name)))
+    elif is_sparse(value):
+        matrix: Any = sparse.csr_array(value)
+        digest.update(f"sparse{matrix.shape}".encode())
+        for array in [matrix.data, matrix.indices, matrix.indptr]:
+            digest.update(np.ascontiguousarray(array).tobytes())
+    else:
+        array = np.ascontiguousarray(value, dtype=float)
+        digest.update(f"dense{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.digest()
+
+
+# lower expectations by credal set and gamble, with least recently used
+# entries evicted first once there are more than max_size
+@dataclass
+class ExpectationCache:
+    max_size: int = 65536
+    entries: OrderedDict[tuple[bytes, bytes], float] = field(
+        default_factory=OrderedDict
+    )
+    hits: int = 0
+    misses: int = 0
+
+    def get(self, key: tuple[bytes, bytes]) -> float | None:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple[bytes, bytes], value: float) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+def cached_lower_expectations(
+    cache: ExpectationCache,
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Array:
+    xss: Any = as_matrix(gambles)
+    if is_sparse(xss):
+        # rows are hashed and evaluated without densifying them
+        xss = sparse.csr_array(xss)
+        rows: Iterable[Any] = (xss[[i]] for i in range(xss.shape[0]))
+    else:
+        rows = xss.reshape(len(xss), -1)
+    credal_set_hash = content_hash(credal_set)
+    keys = [(credal_set_hash, content_hash(xs)) for xs in rows]
+    result = np.empty(len(keys))
+    missing = []
+    for i, key in enumerate(keys):
+        value = cache.get(key)
+        if value is None:
+            missing.append(i)
+        else:
+            result[i] = value
+    if missing:
+        # evaluate all missing gambles at once
+        result[missing] = lower_expectations(credal_set, xss[missing])
+        for i in missing:
+            cache.put(keys[i], float(result[i]))
+    return result
+
+
+def test_expectation_cache() -> None:
+    credal_set = [[0.2, 0.2, 0.6], [0.1, 0.1, 0.8]]
+    cache = ExpectationCache(max_size=3)
+    assert lower_expectations(credal_set, [[5, 3, 1]], cache) == pytest.approx([1.6])
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert lower_expectations(credal_set, [[5, 3, 1]], cache) == pytest.approx([1.6])
+    assert (cache.hits, cache.misses) == (1, 1)
+    # conjugacy: the upper expectation of -x is minus the lower one of x
+    assert upper_expectations(credal_set, [[-5, -3, -1]], cache) == pytest.approx(
+        [-1.6]
+    )
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert upper_expectations(credal_set, [[1, 4, 2]], cache) == pytest.approx([2.2])
+    assert hurwicz_expectations(0.5, credal_set, [[1, 4, 2]], cache) == pytest.approx(
+        [2.15]
+    )
+    assert (cache.hits, cache.misses) == (3, 3)
+    # another credal set with the same gamble is another entry
+    other = ConstraintCredalSet(a=[[1, 0, 0]], b=[0.5])
+    assert lower_expectations(other, [[5, 3, 1]], cache) == pytest.approx([3])
+    assert lower_expectations(other, [[5, 3, 1]], cache) == pytest.approx([3])
+    assert (cache.hits, cache.misses) == (4, 4)
+    assert len(cache.entries) == 3
+    # the least recently used entry is gone
+    lower_expectations(credal_set, [[5, 3, 1]], cache)
+    assert (cache.hits, cache.misses) == (4, 5)
+
+
+def test_expectation_cache_batch() -> None:
+    rng = np.random.default_rng(0)
+    credal_set = rng.dirichlet(np.ones(4), size=5)
+    gambles = rng.normal(size=(50, 4))
+    cache = ExpectationCache()
+    assert lower_expectations(credal_set, gambles[:30], cache) == pytest.approx(
+        lower_expectations(credal_set, gambles[:30])
+    )
+    assert upper_expectations(credal_set, -gambles, cache) == pytest.approx(
+        upper_expectations(credal_set, -gambles)
+    )
+    assert (cache.hits, cache.misses) == (30, 50)
+    assert hurwicz_expectations(0.3, credal_set, gambles, cache) == pytest.approx(
+        hurwicz_expectations(0.3, credal_set, gambles)
+    )
+    assert (cache.hits, cache.misses) == (80, 100)
+    assert content_hash(credal_set) == content_hash(credal_set.tolist())
+    assert content_hash(credal_set) != content_hash(credal_set.T)
+
+
+@pytest.mark.skipif(sparse is None, reason="scipy is not installed")
+def test_expectation_cache_sparse() -> None:
+    n = 1_000_000
+    credal_set = sparse_matrix(n, [([0, 1], [0.5, 0.5]), ([0, n - 1], [0.9, 0.1])])
+    gambles = sparse_matrix(n, [([n - 1], [10.0]), ([0, 1], [1.0, 3.0])])
+    cache = ExpectationCache()
+
+    def peak_memory(function: Callable[[], Array]) -> int:
+        tracemalloc.start()
+        try:
+            assert function() == pytest.approx([0, 0.9])
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # the gambles are never densified, which would take 16MB
+    assert peak_memory(
+        partial(lower_expectations, credal_set, gambles, cache)
+    ) < peak_memory(partial(lower_expectations, credal_set, gambles)) + (1 << 20)
+    assert lower_expectations(credal_set, gambles, cache) == pytest.approx([0, 0.9])
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
 def is_gamma_maxi_something(
     # something = gamble -> float (e.g. lower prevision, upper prevision, ...)
     something: Callable[[Gamble], float],
@@ -66,6 +465,11 @@ def is_gamma_maxi_something(
     return [value + TOL >= max_value for value in values]
 
 
+# same as is_gamma_maxi_something, for values that have already been calculated
+def is_gamma_maxi_values(values: Array) -> Sequence[bool]:
+    return (values + TOL >= values.max()).tolist()
+
+
 def is_gamma_maximin(
     credal_set: Sequence[PMF],
     gambles: Sequence[Gamble],
@@ -76,11 +480,23 @@ def is_gamma_maximin(
     return is_gamma_maxi_something(something, gambles)
 
 
+# same as is_gamma_maximin, with all lower expectations in one batch
+def is_gamma_maximin_2(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    return is_gamma_maxi_values(lower_expectations(credal_set, gambles))
+
+
 def test_is_gamma_maximin() -> None:
     assert is_gamma_maximin(
         credal_set=[[0.5, 0.5], [0.8, 0.2]],
         gambles=[[440, 260], [420, 300], [370, 370]],
     ) == [False, False, True]
+    assert is_gamma_maximin_2(
+        credal_set=[[0.5, 0.5], [0.8, 0.2]],
+        gambles=[[440, 260], [420, 300], [370, 370]],
+    ) == [False, False, True]
 
 
 def is_gamma_maximax(
@@ -94,11 +510,23 @@ def is_gamma_maximax(
     return is_gamma_maxi_something(something, gambles)
 
 
+# same as is_gamma_maximax, with all upper expectations in one batch
+def is_gamma_maximax_2(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    return is_gamma_maxi_values(upper_expectations(credal_set, gambles))
+
+
 def test_is_gamma_maximax() -> None:
     assert is_gamma_maximax(
         credal_set=[[0.5, 0.5], [0.8, 0.2]],
         gambles=[[440, 260], [420, 300], [370, 370]],
     ) == [True, False, False]
+    assert is_gamma_maximax_2(
+        credal_set=[[0.5, 0.5], [0.8, 0.2]],
+        gambles=[[440, 260], [420, 300], [370, 370]],
+    ) == [True, False, False]
 
 
 def hurwicz_expectation(
@@ -112,6 +540,15 @@ def hurwicz_expectation(
     return transform_expectations(hurwicz, credal_set, gamble)
 
 
+def hurwicz_expectations(
+    beta: float,
+    credal_set: CredalSet,
+    gambles: Gambles,
+    cache: ExpectationCache | None = None,
+) -> Array:
+    return lower_upper_expectations(credal_set, gambles, cache).hurwicz(beta)
+
+
 def is_hurwicz(
     beta: float,
     credal_set: Sequence[PMF],
@@ -123,12 +560,175 @@ def is_hurwicz(
     return is_gamma_maxi_something(something, gambles)
 
 
+# same as is_hurwicz, with all lower and upper expectations in one batch
+def is_hurwicz_2(
+    beta: float,
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    return is_gamma_maxi_values(hurwicz_expectations(beta, credal_set, gambles))
+
+
 def test_is_hurwicz() -> None:
     assert is_hurwicz(
         beta=0.5,
         credal_set=[[0.5, 0.5], [0.8, 0.2]],
         gambles=[[440, 260], [420, 300], [370, 370]],
     ) == [False, True, False]
+    assert is_hurwicz_2(
+        beta=0.5,
+        credal_set=[[0.5, 0.5], [0.8, 0.2]],
+        gambles=[[440, 260], [420, 300], [370, 370]],
+    ) == [False, True, False]
+
+
+class HurwiczInterval(NamedTuple):
+    beta_min: float
+    beta_max: float
+    choices: Sequence[int]  # hurwicz optimal gambles for all beta in between
+
+
+# lines on the upper envelope of intercepts + beta * slopes, in order of
+# increasing slope, which is also the order in which they are maximal
+def upper_envelope(intercepts: Array, slopes: Array) -> IntArray:
+    hull: list[int] = []
+    # best intercept first on ties
+    for i in np.lexsort((-intercepts, slopes)):
+        if hull and slopes[hull[-1]] == slopes[i]:
+            continue
+        while len(hull) >= 2:
+            a, b = hull[-2], hull[-1]
+            # line b is not needed if line i takes over from line a before it
+            if (intercepts[a] - intercepts[i]) * (slopes[b] - slopes[a]) > (
+                intercepts[a] - intercepts[b]
+            ) * (slopes[i] - slopes[a]):
+                break
+            hull.pop()
+        hull.append(int(i))
+    return np.array(hull)
+
+
+# hurwicz optimal gambles as a function of beta; the hurwicz expectation of
+# every gamble is linear in beta, so only the upper envelope of these lines
+# needs to be computed, and every line is within TOL of it on an interval
+def hurwicz_intervals(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[HurwiczInterval]:
+    lowers, uppers = lower_upper_expectations(credal_set, gambles)
+    if len(uppers) == 0:
+        return []
+    # gambles that are not interval maximal stay below the envelope
+    (candidates,) = np.nonzero(uppers + TOL >= lowers.max())
+    intercepts = uppers[candidates]
+    slopes = lowers[candidates] - intercepts
+    lines = upper_envelope(intercepts, slopes)
+    crossings = -np.diff(intercepts[lines]) / np.diff(slopes[lines])
+    knots = np.concatenate([[0], crossings[(crossings > 0) & (crossings < 1)], [1]])
+    # envelope at the knots, and its slope between consecutive knots
+    active = lines[np.searchsorted(crossings, knots, side="right")]
+    envelope = intercepts[active] + knots * slopes[active]
+    middles = (knots[:-1] + knots[1:]) / 2
+    envelope_slopes = slopes[lines[np.searchsorted(crossings, middles, side="right")]]
+
+    def gap(indices: IntArray, k: IntArray) -> Array:
+        return intercepts[indices] + knots[k] * slopes[indices] - envelope[k] + TOL
+
+    # the gap to the envelope is concave, with its maximum at knot peak
+    peaks = np.searchsorted(envelope_slopes, slopes, side="left")
+    (indices,) = np.nonzero(gap(np.arange(len(slopes)), peaks) >= 0)
+    peaks = peaks[indices]
+    # first knot before, and last knot after, the peak within TOL
+    firsts, lo = peaks.copy(), np.zeros_like(peaks)
+    lasts, hi = peaks.copy(), np.full_like(peaks, len(knots) - 1)
+    while np.any(lo < firsts) or np.any(lasts < hi):
+        mid = (lo + firsts) // 2
+        is_close = gap(indices, mid) >= 0
+        firsts, lo = np.where(is_close, mid, firsts), np.where(is_close, lo, mid + 1)
+        mid = (lasts + hi + 1) // 2
+        is_close = gap(indices, mid) >= 0
+        lasts, hi = np.where(is_close, mid, lasts), np.where(is_close, hi, mid - 1)
+    # interpolate the exact beta where the line gets within TOL
+    starts = knots[firsts].copy()
+    is_inner = firsts > 0
+    k = firsts[is_inner] - 1
+    starts[is_inner] = knots[k] - gap(indices[is_inner], k) / (
+        slopes[indices[is_inner]] - envelope_slopes[k]
+    )
+    stops = knots[lasts].copy()
+    is_inner = lasts < len(knots) - 1
+    k = lasts[is_inner]
+    stops[is_inner] = knots[k] - gap(indices[is_inner], k) / (
+        slopes[indices[is_inner]] - envelope_slopes[k]
+    )
+    # sweep over the breakpoints
+    breakpoints = np.unique(np.concatenate([[0, 1], starts, stops]))
+    entering: list[list[int]] = [[] for _ in breakpoints]
+    leaving: list[list[int]] = [[] for _ in breakpoints]
+    for i, start, stop in zip(
+        candidates[indices].tolist(),
+        np.searchsorted(breakpoints, starts).tolist(),
+        np.searchsorted(breakpoints, stops).tolist(),
+    ):
+        entering[start].append(i)
+        leaving[stop].append(i)
+    result: list[HurwiczInterval] = []
+    choices: set[int] = set()
+    for j, (beta_min, beta_max) in enumerate(zip(breakpoints[:-1], breakpoints[1:])):
+        choices |= set(entering[j])
+        choices -= set(leaving[j])
+        if result and set(result[-1].choices) == choices:
+            result[-1] = result[-1]._replace(beta_max=float(beta_max))
+        else:
+            result.append(
+                HurwiczInterval(float(beta_min), float(beta_max), sorted(choices))
+            )
+    return result
+
+
+def test_hurwicz_intervals() -> None:
+    intervals = hurwicz_intervals(
+        credal_set=[[0.5, 0.5], [0.8, 0.2]],
+        gambles=[[440, 260], [420, 300], [370, 370]],
+    )
+    assert [interval.choices for interval in intervals] == [
+        [0],
+        [0, 1],
+        [1],
+        [1, 2],
+        [2],
+    ]
+    assert [interval.beta_max for interval in intervals] == pytest.approx(
+        [(8 - TOL) / 18, (8 + TOL) / 18, (26 - TOL) / 36, (26 + TOL) / 36, 1],
+        rel=1e-12,
+    )
+    assert intervals[0].beta_min == 0
+    assert hurwicz_intervals(ConstraintCredalSet(a=[[1, 0]], b=[0.5]), []) == []
+    assert hurwicz_intervals([[0.5, 0.5]], [[1, 3], [3, 1]]) == [
+        HurwiczInterval(0, 1, [0, 1])
+    ]
+
+
+def test_hurwicz_intervals_random() -> None:
+    rng = np.random.default_rng(0)
+    for n in [1, 2, 10, 100]:
+        credal_set = rng.dirichlet(np.ones(3), size=4).tolist()
+        gambles = rng.normal(size=(n, 3))
+        # duplicate and nearly duplicate gambles
+        gambles = np.vstack([gambles, gambles[: n // 2] + TOL / 3]).tolist()
+        intervals = hurwicz_intervals(credal_set, gambles)
+        assert intervals[0].beta_min == 0
+        assert intervals[-1].beta_max == 1
+        for interval, next_interval in zip(intervals, intervals[1:]):
+            assert interval.beta_max == next_interval.beta_min
+        for beta in rng.uniform(size=200):
+            (interval,) = [
+                interval
+                for interval in intervals
+                if interval.beta_min < beta < interval.beta_max
+            ]
+            is_hurwicz_beta = is_hurwicz(beta, credal_set, gambles)
+            assert interval.choices == np.flatnonzero(is_hurwicz_beta).tolist()
 
 
 # check dominance between two vectors, using min and max values
@@ -151,6 +751,34 @@ def is_maximal(
     return [is_not_dominated(xs) for xs in xss]
 
 
+# maximal elements of a stream of vectors; every new vector is only compared
+# with the vectors that are still maximal, and only those are kept
+@dataclass
+class MaximalSet:
+    # compares two vectors
+    dominates: Callable[[Sequence[float], Sequence[float]], bool]
+    # number of vectors added so far
+    size: int = 0
+    # vectors that are still maximal, by the order in which they were added
+    survivors: dict[int, Sequence[float]] = field(default_factory=dict)
+
+    # add a vector, and return whether it is maximal
+    def add(self, xs: Sequence[float]) -> bool:
+        index = self.size
+        self.size += 1
+        if any(self.dominates(ys, xs) for ys in self.survivors.values()):
+            return False
+        self.survivors = {
+            i: ys for i, ys in self.survivors.items() if not self.dominates(xs, ys)
+        }
+        self.survivors[index] = xs
+        return True
+
+    @property
+    def maximal(self) -> Sequence[Sequence[float]]:
+        return list(self.survivors.values())
+
+
 def is_maximal_2(
     # compares two vectors
     dominates: Callable[[Sequence[float], Sequence[float]], bool],
@@ -177,6 +805,63 @@ def is_maximal_2(
         return [not is_ys_dominated] + is_max_zss_2
 
 
+# same as is_maximal_2, without recursion, and only keeping the survivors
+def is_maximal_3(
+    # compares two vectors
+    dominates: Callable[[Sequence[float], Sequence[float]], bool],
+    # sequence of vectors
+    xss: Sequence[Sequence[float]],
+) -> Sequence[bool]:
+    # the last vector is processed first, as in is_maximal_2
+    maximal_set = MaximalSet(dominates)
+    for xs in reversed(xss):
+        maximal_set.add(xs)
+    result = [False] * len(xss)
+    for i in maximal_set.survivors:
+        result[len(xss) - 1 - i] = True
+    return result
+
+
+def test_maximal_set() -> None:
+    maximal_set = MaximalSet(pointwise_dominates)
+    assert maximal_set.add([1, 1])
+    assert maximal_set.add([2, 0])
+    assert not maximal_set.add([0.5, 0.5])
+    assert maximal_set.add([1.5, 3])
+    assert maximal_set.maximal == [[2, 0], [1.5, 3]]
+    assert maximal_set.survivors == {1: [2, 0], 3: [1.5, 3]}
+    assert maximal_set.size == 4
+    # memory only grows with the number of survivors
+    for x in range(1000):
+        maximal_set.add([x, x])
+    assert maximal_set.survivors == {1003: [999, 999]}
+
+
+def test_is_maximal_3() -> None:
+    # a relation that is not transitive, so the order of comparisons matters
+    def first_dominates(xs: Sequence[float], ys: Sequence[float]) -> bool:
+        return xs[0] > ys[0] + 1 or xs[1] > ys[0] + 2
+
+    rng = np.random.default_rng(0)
+    for n in [0, 1, 5, 50]:
+        xss = rng.integers(0, 6, size=(n, 2)).tolist()
+        for dominates in [first_dominates, interval_dominates, pointwise_dominates]:
+            assert is_maximal_3(dominates, xss) == is_maximal_2(dominates, xss)
+    # well beyond the recursion limit of is_maximal_2
+    xss = rng.normal(size=(5000, 2))
+    assert is_maximal_3(interval_dominates, xss.tolist()) == is_interval_maximal_2(
+        [[1, 0], [0, 1]], xss.tolist()
+    )
+
+
+# interval dominance only depends on the lower and upper expectations
+def lower_upper_vectors(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[Sequence[float]]:
+    return np.column_stack(lower_upper_expectations(credal_set, gambles)).tolist()
+
+
 def is_interval_maximal(
     credal_set: Sequence[PMF],
     gambles: Sequence[Gamble],
@@ -204,12 +889,31 @@ def is_interval_maximal_3(
     return is_maximal_2(interval_dominates, xss)
 
 
+# same as is_interval_maximal_3, without recursion, so for any number of gambles
+def is_interval_maximal_4(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    return is_maximal_3(interval_dominates, lower_upper_vectors(credal_set, gambles))
+
+
+# same as is_interval_maximal_2, with all lower and upper expectations in one batch
+def is_interval_maximal_5(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    lowers, uppers = lower_upper_expectations(credal_set, gambles)
+    return (uppers + TOL >= lowers.max()).tolist()
+
+
 def test_is_interval_maximal() -> None:
     credal_set: Sequence[Sequence[float]] = [[0.5, 0.5], [0.8, 0.2]]
     gambles: Sequence[Sequence[float]] = [[440, 260], [420, 300], [370, 370]]
     assert is_interval_maximal(credal_set, gambles) == [True, True, True]
     assert is_interval_maximal_2(credal_set, gambles) == [True, True, True]
     assert is_interval_maximal_3(credal_set, gambles) == [True, True, True]
+    assert is_interval_maximal_4(credal_set, gambles) == [True, True, True]
+    assert is_interval_maximal_5(credal_set, gambles) == [True, True, True]
 
 
 # check dominance between two vectors, pointwise
@@ -220,6 +924,18 @@ def pointwise_dominates(
     return all(x > y + TOL for x, y in zip(xs, ys))
 
 
+# robust bayes dominance relation, and the vectors it compares
+def rbayes_dominance(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> tuple[
+    Callable[[Sequence[float], Sequence[float]], bool], Sequence[Sequence[float]]
+]:
+    if isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        return lower_rbayes_dominance(credal_set, gambles)
+    return pointwise_dominates, expectation_matrix(credal_set, gambles).tolist()
+
+
 def is_rbayes_maximal(
     credal_set: Sequence[PMF],
     gambles: Sequence[Gamble],
@@ -236,11 +952,209 @@ def is_rbayes_maximal_2(
     return is_maximal_2(pointwise_dominates, xss)
 
 
+# same as is_rbayes_maximal_2, without recursion, so for any number of gambles
+def is_rbayes_maximal_4(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    return is_maximal_3(*rbayes_dominance(credal_set, gambles))
+
+
 def test_is_rbayes_maximal() -> None:
     credal_set: Sequence[Sequence[float]] = [[0.5, 0.5], [0.8, 0.2]]
     gambles: Sequence[Sequence[float]] = [[440, 260], [420, 300], [370, 370]]
     assert is_rbayes_maximal(credal_set, gambles) == [True, True, True]
     assert is_rbayes_maximal_2(credal_set, gambles) == [True, True, True]
+    assert is_rbayes_maximal_4(credal_set, gambles) == [True, True, True]
+
+
+# result[i] is True whenever xss[i] is pointwise dominated by a row of yss
+def is_pointwise_dominated(yss: Array, xss: Array, chunk_size: int = 256) -> BoolArray:
+    result = np.zeros(len(xss), dtype=bool)
+    bounds = (xss + TOL).T
+    for start in range(0, len(yss), chunk_size):
+        chunk = yss[start : start + chunk_size].T
+        # one coordinate at a time is much faster than np.all over a short axis
+        is_dominated = np.ones((chunk.shape[1], len(xss)), dtype=bool)
+        for ys, xs in zip(chunk, bounds):
+            is_dominated &= ys[:, np.newaxis] > xs
+        result |= np.any(is_dominated, axis=0)
+    return result
+
+
+# pareto skyline of the rows of xss under pointwise dominance,
+# same result as is_maximal(pointwise_dominates, xss.tolist())
+def pointwise_maximal(xss: Array, block_size: int = 256) -> BoolArray:
+    n, k = xss.shape
+    if k == 0:  # every row dominates every row
+        return np.zeros(n, dtype=bool)
+    if k <= 2:
+        # sweep in decreasing order of the first coordinate,
+        # tracking the largest last coordinate seen so far
+        order = np.argsort(-xss[:, 0], kind="stable")
+        firsts = -xss[order, 0]
+        lasts = np.maximum.accumulate(xss[order, -1])
+        counts = np.searchsorted(firsts, -(xss[:, 0] + TOL), side="left")
+        return ~((counts > 0) & (lasts[counts - 1] > xss[:, -1] + TOL))
+    # a row can only be dominated by rows with a larger sum,
+    # so in this order the skyline so far never needs to be revised
+    order = np.argsort(-xss.sum(axis=1), kind="stable")
+    result = np.zeros(n, dtype=bool)
+    skyline = np.empty((n, k))
+    size = 0
+    for start in range(0, n, block_size):
+        indices = order[start : start + block_size]
+        block = xss[indices]
+        is_dominated = is_pointwise_dominated(skyline[:size], block)
+        # by transitivity, only the remaining rows need to be compared
+        remaining = block[~is_dominated]
+        is_dominated[~is_dominated] = is_pointwise_dominated(remaining, remaining)
+        maximal = block[~is_dominated]
+        skyline[size : size + len(maximal)] = maximal
+        size += len(maximal)
+        result[indices] = ~is_dominated
+    return result
+
+
+def is_rbayes_maximal_3(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    if isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        return is_rbayes_maximal_4(credal_set, gambles)
+    return pointwise_maximal(expectation_matrix(credal_set, gambles)).tolist()
+
+
+def test_pointwise_maximal() -> None:
+    rng = np.random.default_rng(0)
+    for k in range(5):
+        for n in [0, 1, 2, 10, 300, 700]:
+            # few distinct values, so many ties and near ties
+            xss = rng.integers(-3, 3, size=(n, k)) * TOL / 2 + rng.integers(
+                0, 3, size=(n, 1)
+            ) * rng.integers(0, 2, size=(1, k))
+            assert pointwise_maximal(xss).tolist() == is_maximal(
+                pointwise_dominates, xss.tolist()
+            )
+            xss = rng.normal(size=(n, k))
+            assert pointwise_maximal(xss, block_size=7).tolist() == is_maximal(
+                pointwise_dominates, xss.tolist()
+            )
+
+
+def test_pointwise_maximal_large() -> None:
+    rng = np.random.default_rng(0)
+    for k in [2, 4]:
+        xss = rng.normal(size=(100_000, k))
+        result = pointwise_maximal(xss)
+        # no skyline row is dominated, all other rows are
+        assert not np.any(is_pointwise_dominated(xss[result], xss[result]))
+        assert np.all(is_pointwise_dominated(xss[result], xss[~result]))
+
+
+def test_is_rbayes_maximal_3() -> None:
+    gambles = [[3, 9, 2], [4, 4, 4], [0, 3, 6], [6, 2, 1]]
+    credal_set = [[0.4, 0.5, 0.1], [0.1, 0.8, 0.1], [0.6, 0.2, 0.2]]
+    assert is_rbayes_maximal_3(credal_set, gambles) == [True, True, False, True]
+    rvars: Sequence[Sequence[float]] = [
+        [4, 0],
+        [0, 4],
+        [3, 2],
+        [0.5, 3],
+        [2.35, 2.35],
+        [4.1, -0.3],
+    ]
+    credal_set_2 = ConstraintCredalSet(a=[[1, 0], [0, 1]], b=[0.28, 0.3])
+    assert is_rbayes_maximal_3(credal_set_2, rvars) == is_rbayes_maximal(
+        [[0.28, 0.72], [0.7, 0.3]], rvars
+    )
+
+
+def test_is_maximal_3_criteria_large() -> None:
+    # well beyond the recursion limit of is_interval_maximal_3 and is_rbayes_maximal_2
+    credal_set, gambles = random_problem(0, 3000, 3, 4, dominated=0.5)
+    pmfs, rvars = credal_set.tolist(), gambles.tolist()
+    assert is_interval_maximal_4(pmfs, rvars) == is_interval_maximal_2(pmfs, rvars)
+    assert is_rbayes_maximal_4(pmfs, rvars) == is_rbayes_maximal_3(pmfs, rvars)
+
+
+# is_maximal for rows start to stop of a matrix in shared memory
+def is_maximal_shard(
+    dominates: Callable[[Sequence[float], Sequence[float]], bool],
+    name: str,
+    shape: tuple[int, int],
+    start: int,
+    stop: int,
+) -> Sequence[bool]:
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        xss = np.ndarray(shape, dtype=float, buffer=memory.buf)
+        # vectorised versions of the common relations do the same comparisons
+        if dominates is pointwise_dominates:
+            result = (~is_pointwise_dominated(xss, xss[start:stop])).tolist()
+        elif dominates is interval_dominates:
+            maxmin = xss.min(axis=1).max(initial=-np.inf)
+            result = (~(maxmin > xss[start:stop].max(axis=1) + TOL)).tolist()
+        else:
+            yss = xss.tolist()
+            result = [
+                all(not dominates(ys, xs) for ys in yss) for xs in yss[start:stop]
+            ]
+        del xss
+        return result
+    finally:
+        memory.close()
+
+
+# same as is_maximal, with the vectors shared by all processes, and each
+# process checking a contiguous shard of them; the relation must be picklable
+def is_maximal_parallel(
+    dominates: Callable[[Sequence[float], Sequence[float]], bool],
+    xss: Sequence[Sequence[float]] | Array,
+    max_workers: int | None = None,
+    shard_size: int = 1024,
+) -> Sequence[bool]:
+    values = np.asarray(xss, dtype=float)
+    if values.size == 0:
+        return is_maximal(dominates, values.tolist())
+    memory = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    try:
+        shared = np.ndarray(values.shape, dtype=float, buffer=memory.buf)
+        shared[:] = values
+        del shared
+        starts = range(0, len(values), shard_size)
+        stops = [min(start + shard_size, len(values)) for start in starts]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            shards = executor.map(
+                is_maximal_shard,
+                repeat(dominates),
+                repeat(memory.name),
+                repeat(values.shape),
+                starts,
+                stops,
+            )
+            # map returns the shards in order
+            return [is_max for shard in shards for is_max in shard]
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_is_maximal_parallel() -> None:
+    rng = np.random.default_rng(0)
+    xss = rng.normal(size=(500, 3))
+    # exact ties and near ties as well
+    xss[250:] = np.round(xss[:250], 1) + rng.integers(-1, 2, size=(250, 3)) * TOL
+    relations: list[Callable[[Sequence[float], Sequence[float]], bool]] = [
+        pointwise_dominates,
+        interval_dominates,
+        partial(pointwise_dominates),  # not vectorised
+    ]
+    for dominates in relations:
+        assert is_maximal_parallel(
+            dominates, xss, max_workers=2, shard_size=64
+        ) == is_maximal(dominates, xss.tolist())
+    assert is_maximal_parallel(pointwise_dominates, []) == []
 
 
 def is_rbayes_admissible(
@@ -258,6 +1172,20 @@ def is_rbayes_admissible(
     return union([arg_max(pmf) for pmf in credal_set])
 
 
+# same as is_rbayes_admissible, with all expectations in one batch
+def is_rbayes_admissible_2(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    # a credal set given by constraints is convex,
+    # so admissibility is e-admissibility
+    if isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        return is_e_admissible(credal_set, gambles)
+    xss = expectation_matrix(credal_set, gambles)
+    # union, over all pmfs, of the gambles with maximal expectation
+    return (xss + TOL >= xss.max(axis=0)).any(axis=1).tolist()
+
+
 def test_is_rbayes_admissible() -> None:
     assert is_rbayes_admissible(
         credal_set=[[0.5, 0.5], [0.8, 0.2]],
@@ -267,6 +1195,10 @@ def test_is_rbayes_admissible() -> None:
         credal_set=[[0.5, 0.5], [0.65, 0.35], [0.8, 0.2]],
         gambles=[[440, 260], [420, 300], [370, 370]],
     ) == [True, True, True]
+    assert is_rbayes_admissible_2(
+        credal_set=[[0.5, 0.5], [0.65, 0.35], [0.8, 0.2]],
+        gambles=[[440, 260], [420, 300], [370, 370]],
+    ) == [True, True, True]
 
 
 def combine(
@@ -281,6 +1213,1226 @@ def test_combine() -> None:
     assert combine(0.5, [0.5, 0.5], [0.8, 0.2]) == pytest.approx([0.65, 0.35])
 
 
+# tolerance for pivoting in the simplex method
+EPS = 1e-9
+
+
+class Tableau(NamedTuple):
+    table: Array  # rows [a | b] of a @ x == b, in canonical form for the basis
+    basis: IntArray  # index of the basic variable of every row
+
+
+def simplex_pivot(tableau: Tableau, row: int, column: int) -> None:
+    table = tableau.table
+    table[row] /= table[row, column]
+    factors = table[:, column].copy()
+    factors[row] = 0
+    table -= np.outer(factors, table[row])
+    tableau.basis[row] = column
+
+
+# minimise cost @ x starting from a basic feasible solution;
+# dantzig's rule is used, except after a degenerate pivot, where bland's rule
+# is used to avoid cycling
+def simplex_solve(tableau: Tableau, cost: Array) -> None:
+    table, basis = tableau
+    degenerate = False
+    while True:
+        reduced = cost - cost[basis] @ table[:, :-1]
+        candidates = np.flatnonzero(reduced < -EPS)
+        if len(candidates) == 0:
+            return
+        column = (
+            candidates[0] if degenerate else candidates[reduced[candidates].argmin()]
+        )
+        is_positive = table[:, column] > EPS
+        if not is_positive.any():
+            raise ValueError("linear program is unbounded")
+        ratios = np.full(len(table), np.inf)
+        ratios[is_positive] = table[is_positive, -1] / table[is_positive, column]
+        rows = np.flatnonzero(ratios <= ratios.min() + EPS)
+        row = rows[basis[rows].argmin()]
+        degenerate = ratios[row] <= EPS
+        simplex_pivot(tableau, int(row), int(column))
+
+
+# basic feasible solution of a @ x == b, x >= 0, or None if there is none
+def simplex_phase_one(a: Array, b: Array) -> Tableau | None:
+    m, n = a.shape
+    signs = np.where(b < 0, -1.0, 1.0)[:, np.newaxis]
+    tableau = Tableau(
+        table=np.hstack([signs * a, np.eye(m), signs * b[:, np.newaxis]]),
+        basis=np.arange(n, n + m),
+    )
+    simplex_solve(tableau, np.concatenate([np.zeros(n), np.ones(m)]))
+    if tableau.table[:, -1] @ (tableau.basis >= n) > EPS * max(1, m):
+        return None
+    # drive the remaining artificial variables out of the basis,
+    # dropping redundant constraints
+    keep = np.ones(m, dtype=bool)
+    for row in np.flatnonzero(tableau.basis >= n):
+        columns = np.flatnonzero(np.abs(tableau.table[row, :n]) > EPS)
+        if len(columns) == 0:
+            keep[row] = False
+        else:
+            simplex_pivot(tableau, int(row), int(columns[0]))
+    return Tableau(
+        table=tableau.table[keep][:, list(range(n)) + [-1]],
+        basis=tableau.basis[keep],
+    )
+
+
+# optimal solution of minimising cost @ x, from the result of phase one
+def simplex_phase_two(tableau: Tableau, cost: Array) -> Array:
+    tableau = Tableau(table=tableau.table.copy(), basis=tableau.basis.copy())
+    simplex_solve(tableau, cost)
+    x = np.zeros(len(cost))
+    x[tableau.basis] = tableau.table[:, -1]
+    return x
+
+
+# minimise c @ x subject to a_ub @ x <= b_ub, a_eq @ x == b_eq, and
+# bounds[j, 0] <= x[j] <= bounds[j, 1], with x >= 0 if there are no bounds;
+# lower bounds must be finite, upper bounds can be infinite; a_ub and a_eq
+# can be sparse; returns None if there is no feasible solution
+def linear_program(
+    c: npt.ArrayLike,
+    a_ub: npt.ArrayLike | SparseMatrix | None = None,
+    b_ub: npt.ArrayLike | None = None,
+    a_eq: npt.ArrayLike | SparseMatrix | None = None,
+    b_eq: npt.ArrayLike | None = None,
+    bounds: npt.ArrayLike | None = None,
+) -> Array | None:
+    cost = np.asarray(c, dtype=float)
+    n = len(cost)
+    a_ub_ = constraint_rows(a_ub, n)
+    a_eq_ = constraint_rows(a_eq, n)
+    b_ub_ = np.asarray([] if b_ub is None else b_ub, dtype=float).reshape(-1)
+    b_eq_ = np.asarray([] if b_eq is None else b_eq, dtype=float).reshape(-1)
+    bounds_ = (
+        np.tile([0, np.inf], (n, 1))
+        if bounds is None
+        else np.asarray(bounds, dtype=float).reshape(n, 2)
+    )
+    if linprog is not None:
+        result: Any = linprog(
+            cost,
+            A_ub=a_ub_ if a_ub_.shape[0] else None,
+            b_ub=b_ub_ if a_ub_.shape[0] else None,
+            A_eq=a_eq_ if a_eq_.shape[0] else None,
+            b_eq=b_eq_ if a_eq_.shape[0] else None,
+            bounds=bounds_,
+            method="highs",
+        )
+        if result.status == 2:
+            return None
+        if result.status != 0:
+            raise ValueError(result.message)
+        return np.asarray(result.x)
+    # shift x by its lower bounds, so that x >= 0, and turn the finite upper
+    # bounds into inequalities
+    lower, upper = bounds_.T
+    is_bounded = np.isfinite(upper)
+    a_ub_dense = np.vstack([dense_matrix(a_ub_), np.eye(n)[is_bounded]])
+    a_eq_dense = dense_matrix(a_eq_)
+    b_ub_ = np.concatenate([b_ub_, upper[is_bounded]]) - a_ub_dense @ lower
+    b_eq_ = b_eq_ - a_eq_dense @ lower
+    # slack variables turn the inequalities into equalities
+    m = len(a_ub_dense)
+    tableau = simplex_phase_one(
+        np.block(
+            [[a_ub_dense, np.eye(m)], [a_eq_dense, np.zeros((len(a_eq_dense), m))]]
+        ),
+        np.concatenate([b_ub_, b_eq_]),
+    )
+    if tableau is None:
+        return None
+    x = simplex_phase_two(tableau, np.concatenate([cost, np.zeros(m)]))[:n]
+    return lower + x
+
+
+@pytest.fixture(params=["scipy", "simplex"])
+def lp_solver(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    if request.param == "simplex":
+        monkeypatch.setitem(globals(), "linprog", None)
+    elif linprog is None:
+        pytest.skip("scipy is not installed")
+    return request.param
+
+
+def test_linear_program(lp_solver: str) -> None:
+    x = linear_program(c=[-1, -1], a_ub=[[1, 2], [3, 1]], b_ub=[4, 6])
+    assert x == pytest.approx([1.6, 1.2])
+    x = linear_program(
+        c=[1, 2, 3], a_eq=[[1, 1, 1], [2, 2, 2], [1, -1, 0]], b_eq=[1, 2, 0]
+    )
+    assert x == pytest.approx([0.5, 0.5, 0])
+    assert linear_program(c=[1, 1], a_ub=[[1, 1]], b_ub=[-1]) is None
+    assert linear_program(c=[0, 0], a_eq=[[1, 1], [1, -1]], b_eq=[1, 2]) is None
+    bounds: list[list[float]] = [[0, 1], [0.5, np.inf]]
+    x = linear_program(c=[-1, -1], a_ub=[[1, 2], [3, 1]], b_ub=[4, 6], bounds=bounds)
+    assert x == pytest.approx([1, 1.5])
+    assert (
+        linear_program(c=[1, 1], a_eq=[[1, 1]], b_eq=[1], bounds=[[0.6, 1]] * 2) is None
+    )
+    if sparse is not None:
+        x = linear_program(
+            c=[-1, -1], a_ub=sparse.csr_array([[1, 2], [3, 1]]), b_ub=[4, 6]
+        )
+        assert x == pytest.approx([1.6, 1.2])
+
+
+class PrunedCredalSet(NamedTuple):
+    credal_set: Sequence[PMF]  # extreme points only
+    num_removed: int  # number of duplicate or interior pmfs that were removed
+
+
+# remove duplicate pmfs, and pmfs in the convex hull of the other pmfs
+def prune_credal_set(credal_set: Sequence[PMF]) -> PrunedCredalSet:
+    pmfs = np.asarray(credal_set, dtype=float)
+    keep = np.ones(len(pmfs), dtype=bool)
+    for i, pmf in enumerate(pmfs):
+        keep[i] = not np.any(np.all(np.abs(pmfs[:i][keep[:i]] - pmf) <= TOL, axis=1))
+    # a pmf that is the unique maximiser or minimiser of a coordinate is extreme
+    is_extreme = np.zeros(len(pmfs), dtype=bool)
+    indices = np.flatnonzero(keep)
+    if len(indices) > 1:
+        for values in np.hstack([pmfs[indices], -pmfs[indices]]).T:
+            order = np.argsort(values)
+            if values[order[-1]] > values[order[-2]] + TOL:
+                is_extreme[indices[order[-1]]] = True
+    for j in np.flatnonzero(keep & ~is_extreme):
+        others = pmfs[keep & (np.arange(len(pmfs)) != j)]
+        if len(others) == 0:
+            continue
+        weights = linear_program(
+            c=np.zeros(len(others)),
+            a_ub=np.vstack([others.T, -others.T]),
+            b_ub=np.concatenate([pmfs[j] + TOL, TOL - pmfs[j]]),
+            a_eq=np.ones((1, len(others))),
+            b_eq=[1],
+        )
+        keep[j] = weights is None
+    return PrunedCredalSet(
+        credal_set=pmfs[keep].tolist(), num_removed=int(np.sum(~keep))
+    )
+
+
+def test_prune_credal_set(lp_solver: str) -> None:
+    assert prune_credal_set(
+        [[0.5, 0.5], [0.8, 0.2], [0.65, 0.35], [0.5, 0.5]]
+    ) == PrunedCredalSet(credal_set=[[0.5, 0.5], [0.8, 0.2]], num_removed=2)
+    credal_set = [[0.4, 0.5, 0.1], [0.1, 0.8, 0.1], [0.6, 0.2, 0.2], [0.4, 0.4, 0.2]]
+    assert prune_credal_set(credal_set) == PrunedCredalSet(credal_set, num_removed=0)
+    assert prune_credal_set(credal_set + [[0.25, 0.65, 0.1]]) == PrunedCredalSet(
+        credal_set, num_removed=1
+    )
+    assert prune_credal_set([[0.3, 0.7]]).num_removed == 0
+    assert prune_credal_set([[0.3, 0.7], [0.3, 0.7]]).num_removed == 1
+
+
+def test_prune_credal_set_random(lp_solver: str) -> None:
+    rng = np.random.default_rng(0)
+    vertices = rng.dirichlet(np.ones(4), size=5)
+    interior = rng.dirichlet(np.ones(5), size=30) @ vertices
+    credal_set = np.vstack([interior[:15], vertices, interior[15:], vertices[:2]])
+    pruned = prune_credal_set(credal_set.tolist())
+    assert pruned.num_removed == 32
+    assert np.array(pruned.credal_set) == pytest.approx(vertices)
+    gambles = rng.normal(size=(20, 4)).tolist()
+    assert lower_expectations(pruned.credal_set, gambles) == pytest.approx(
+        lower_expectations(credal_set.tolist(), gambles)
+    )
+    assert upper_expectations(pruned.credal_set, gambles) == pytest.approx(
+        upper_expectations(credal_set.tolist(), gambles)
+    )
+
+
+# a convex credal set as the feasible set of a linear program: variables z
+# with a_ub @ z <= b_ub, a_eq @ z == b_eq, and bounds[j, 0] <= z[j] <= bounds[j, 1];
+# to_variables turns gambles over the outcomes into gambles over the variables
+# with the same expectations, so each gamble is linear in z
+class CredalProgram(NamedTuple):
+    a_ub: Array | SparseMatrix
+    b_ub: Array
+    a_eq: Array | SparseMatrix
+    b_eq: Array
+    bounds: Array
+    to_variables: Callable[[Array], Array]
+
+
+# the convex hull of finitely many pmfs: the variables are mixture weights
+def mixture_program(credal_set: npt.ArrayLike | SparseMatrix) -> CredalProgram:
+    k = as_matrix(credal_set).shape[0]
+    return CredalProgram(
+        a_ub=np.zeros((0, k)),
+        b_ub=np.zeros(0),
+        a_eq=np.ones((1, k)),
+        b_eq=np.ones(1),
+        bounds=np.tile([0, np.inf], (k, 1)),
+        to_variables=partial(expectation_matrix, credal_set),
+    )
+
+
+# e-admissibility through one linear program per gamble: find z in the program
+# under which xss[i] @ z is maximal, for xss the gambles over its variables;
+# result marks the gambles already known to be e-admissible, and gambles
+# that are not candidates are skipped
+def e_admissible_search(
+    xss: Array,
+    result: BoolArray,
+    is_candidate: BoolArray,
+    program: CredalProgram,
+) -> BoolArray:
+    n, k = xss.shape
+    result = result.copy()
+    for i in range(n):
+        if result[i] or not is_candidate[i]:
+            continue
+        z = linear_program(
+            c=np.zeros(k),
+            a_ub=stack_rows([xss - xss[i], program.a_ub]),
+            b_ub=np.concatenate([np.full(n, TOL), program.b_ub]),
+            a_eq=program.a_eq,
+            b_eq=program.b_eq,
+            bounds=program.bounds,
+        )
+        if z is not None:
+            result[i] = True
+            # reuse the solution: all gambles optimal under it are e-admissible
+            values = xss @ z
+            result |= values + TOL >= values.max()
+    return result
+
+
+# e-admissibility with respect to the convex hull of the credal set
+def is_e_admissible(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> Sequence[bool]:
+    if isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        program = credal_set.program
+        xss = program.to_variables(dense_matrix(gambles))
+        n = len(xss)
+        return e_admissible_search(
+            xss,
+            result=np.zeros(n, dtype=bool),
+            is_candidate=np.ones(n, dtype=bool),
+            program=program,
+        ).tolist()
+    program = mixture_program(credal_set)
+    xss = expectation_matrix(credal_set, gambles)
+    # gambles that are optimal for an extreme point need no linear program
+    result = (xss + TOL >= xss.max(axis=0)).any(axis=1)
+    # gambles that are not interval maximal cannot be e-admissible
+    is_candidate = xss.max(axis=1) + TOL >= xss.min(axis=1).max()
+    return e_admissible_search(xss, result, is_candidate, program).tolist()
+
+
+def test_is_e_admissible(lp_solver: str) -> None:
+    gambles = [[440, 260], [420, 300], [370, 370]]
+    assert is_e_admissible([[0.5, 0.5], [0.8, 0.2]], gambles) == is_rbayes_admissible(
+        [[0.5, 0.5], [0.65, 0.35], [0.8, 0.2]], gambles
+    )
+    assert is_e_admissible(
+        [[1, 0], [0.5, 0.5], [0, 1]], [[10, 0], [4, 4], [0, 10]]
+    ) == [True, False, True]
+    assert is_e_admissible(
+        [[0.4, 0.5, 0.1], [0.1, 0.8, 0.1], [0.6, 0.2, 0.2]],
+        [[3, 9, 2], [4, 4, 4], [0, 3, 6], [6, 2, 1]],
+    ) == [True, False, False, True]
+    assert is_e_admissible(
+        [[0.28, 0.72], [0.5, 0.5], [0.7, 0.3]],
+        [[4, 0], [0, 4], [3, 2], [0.5, 3], [2.35, 2.35], [4.1, -0.3]],
+    ) == [True, True, True, False, False, False]
+
+
+def test_is_e_admissible_random(lp_solver: str) -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        credal_set = rng.dirichlet(np.ones(4), size=3).tolist()
+        gambles = rng.normal(size=(12, 4)).tolist()
+        result = is_e_admissible(credal_set, gambles)
+        assert all(
+            not a or e
+            for a, e in zip(is_rbayes_admissible(credal_set, gambles), result)
+        )
+        assert all(
+            not e or m for e, m in zip(result, is_rbayes_maximal(credal_set, gambles))
+        )
+
+
+# gambles over the outcomes, for programs whose variables are the pmf itself
+def outcome_gambles(xss: Array) -> Array:
+    return xss
+
+
+# program whose variables are the pmf itself, which sums to one
+def pmf_program(
+    bounds: Array,
+    a_ub: Array | None = None,
+    b_ub: Array | None = None,
+) -> CredalProgram:
+    k = len(bounds)
+    return CredalProgram(
+        a_ub=np.zeros((0, k)) if a_ub is None else a_ub,
+        b_ub=np.zeros(0) if b_ub is None else b_ub,
+        a_eq=np.ones((1, k)),
+        b_eq=np.ones(1),
+        bounds=bounds,
+        to_variables=outcome_gambles,
+    )
+
+
+# credal set of all pmfs p with a @ p >= b, for instance bounds on
+# probabilities, or lower previsions b for the gambles in the rows of a
+@dataclass
+class ConstraintCredalSet:
+    a: Sequence[Gamble]
+    b: Sequence[float]
+    # only needed without constraints, as then a has no rows to tell
+    num_outcomes: int | None = None
+
+    # the constraints as an array, also without any constraints
+    @cached_property
+    def matrix(self) -> Array:
+        if len(self.b):
+            return np.asarray(self.a, dtype=float).reshape(len(self.b), -1)
+        if self.num_outcomes is None:
+            raise ValueError("num_outcomes is required without constraints")
+        return np.zeros((0, self.num_outcomes))
+
+    # basic feasible solution of the constraints, with slack variables;
+    # found once, and shared by all linear programs over the credal set
+    @cached_property
+    def tableau(self) -> Tableau:
+        a = self.matrix
+        m, n = a.shape
+        tableau = simplex_phase_one(
+            np.block([[a, -np.eye(m)], [np.ones((1, n)), np.zeros((1, m))]]),
+            np.append(np.asarray(self.b, dtype=float), 1),
+        )
+        if tableau is None:
+            raise ValueError("credal set is empty")
+        return tableau
+
+    @cached_property
+    def program(self) -> CredalProgram:
+        return pmf_program(
+            bounds=np.tile([0, np.inf], (self.matrix.shape[1], 1)),
+            a_ub=-self.matrix,
+            b_ub=-np.asarray(self.b, dtype=float),
+        )
+
+
+def constraint_lower_expectations(
+    credal_set: ConstraintCredalSet, gambles: Gambles
+) -> Array:
+    m = len(credal_set.a)
+    tableau = Tableau(
+        table=credal_set.tableau.table.copy(), basis=credal_set.tableau.basis.copy()
+    )
+    result = []
+    for gamble in dense_matrix(gambles):
+        # the optimal basis for one gamble is a feasible start for the next
+        cost = np.concatenate([gamble, np.zeros(m)])
+        simplex_solve(tableau, cost)
+        result.append(cost[tableau.basis] @ tableau.table[:, -1])
+    return np.array(result)
+
+
+# robust bayes dominance through lower expectations of differences,
+# for credal sets that are not given by a finite sequence of pmfs
+def lower_rbayes_dominance(
+    credal_set: CredalSet,
+    gambles: Gambles,
+) -> tuple[
+    Callable[[Sequence[float], Sequence[float]], bool], Sequence[Sequence[float]]
+]:
+    def dominates(xs: Sequence[float], ys: Sequence[float]) -> bool:
+        return lower_expectations(credal_set, np.subtract([xs], ys))[0] > TOL
+
+    return dominates, dense_matrix(gambles).tolist()
+
+
+def test_constraint_credal_set(lp_solver: str) -> None:
+    credal_set = ConstraintCredalSet(a=[[1, 0], [-1, 0]], b=[0.5, -0.8])
+    pmfs = [[0.5, 0.5], [0.8, 0.2]]
+    gambles = [[440, 260], [420, 300], [370, 370]]
+    assert lower_expectations(credal_set, gambles) == pytest.approx([350, 360, 370])
+    assert upper_expectations(credal_set, gambles) == pytest.approx([404, 396, 370])
+    assert hurwicz_expectations(0.5, credal_set, [[440, 260]]) == pytest.approx([377])
+    assert is_gamma_maximin_2(credal_set, gambles) == is_gamma_maximin(pmfs, gambles)
+    assert is_gamma_maximax_2(credal_set, gambles) == is_gamma_maximax(pmfs, gambles)
+    assert is_hurwicz_2(0.5, credal_set, gambles) == is_hurwicz(0.5, pmfs, gambles)
+    assert is_interval_maximal_4(credal_set, gambles) == [True, True, True]
+    assert is_interval_maximal_5(credal_set, gambles) == [True, True, True]
+    assert is_rbayes_maximal_3(credal_set, gambles) == [True, True, True]
+    assert is_rbayes_maximal_4(credal_set, gambles) == [True, True, True]
+    assert is_rbayes_admissible_2(credal_set, gambles) == is_e_admissible(pmfs, gambles)
+    with pytest.raises(ValueError, match="empty"):
+        lower_expectations(ConstraintCredalSet(a=[[1, 0]], b=[2]), gambles)
+    # the vacuous credal set: no constraints at all
+    vacuous = ConstraintCredalSet(a=[], b=[], num_outcomes=2)
+    assert lower_expectations(vacuous, gambles) == pytest.approx([260, 300, 370])
+    assert upper_expectations(vacuous, gambles) == pytest.approx([440, 420, 370])
+    assert is_rbayes_admissible_2(vacuous, gambles) == [True, True, True]
+    with pytest.raises(ValueError, match="num_outcomes"):
+        lower_expectations(ConstraintCredalSet(a=[], b=[]), gambles)
+
+
+def test_constraint_credal_set_2(lp_solver: str) -> None:
+    # the convex hull of the pmfs in test_extra_2
+    credal_set = ConstraintCredalSet(a=[[1, 0], [0, 1]], b=[0.28, 0.3])
+    rvars: Sequence[Sequence[float]] = [
+        [4, 0],
+        [0, 4],
+        [3, 2],
+        [0.5, 3],
+        [2.35, 2.35],
+        [4.1, -0.3],
+    ]
+    assert is_gamma_maximin_2(credal_set, rvars) == [
+        False,
+        False,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert is_gamma_maximax_2(credal_set, rvars) == [
+        False,
+        True,
+        False,
+        False,
+        False,
+        False,
+    ]
+    assert is_interval_maximal_4(credal_set, rvars) == [
+        True,
+        True,
+        True,
+        False,
+        True,
+        True,
+    ]
+    assert is_interval_maximal_5(credal_set, rvars) == [
+        True,
+        True,
+        True,
+        False,
+        True,
+        True,
+    ]
+    assert is_rbayes_maximal_3(credal_set, rvars) == [
+        True,
+        True,
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert is_rbayes_maximal_4(credal_set, rvars) == [
+        True,
+        True,
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert is_rbayes_admissible_2(credal_set, rvars) == [
+        True,
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+
+
+def test_constraint_credal_set_random(lp_solver: str) -> None:
+    rng = np.random.default_rng(0)
+    pmfs = rng.dirichlet(np.ones(4), size=5).tolist()
+    # lower previsions of a few gambles, derived from the pmfs
+    a = rng.normal(size=(10, 4)).tolist()
+    credal_set = ConstraintCredalSet(a=a, b=lower_expectations(pmfs, a).tolist())
+    gambles = rng.normal(size=(30, 4)).tolist()
+    lowers = lower_expectations(credal_set, gambles)
+    tableau = credal_set.tableau
+    for gamble, lower in zip(gambles, lowers):
+        pmf = linear_program(
+            c=gamble,
+            a_ub=-np.array(a),
+            b_ub=-np.array(credal_set.b),
+            a_eq=[[1, 1, 1, 1]],
+            b_eq=[1],
+        )
+        assert pmf is not None
+        assert lower == pytest.approx(np.dot(gamble, pmf))
+    assert credal_set.tableau is tableau
+    # the credal set contains the pmfs
+    assert np.all(lowers <= lower_expectations(pmfs, gambles) + TOL)
+    assert np.all(upper_expectations(credal_set, gambles) + TOL >= lowers)
+    result = is_rbayes_admissible_2(credal_set, gambles)
+    assert all(not e or e2 for e, e2 in zip(is_e_admissible(pmfs, gambles), result))
+    assert all(
+        not e or m for e, m in zip(result, is_rbayes_maximal_3(credal_set, gambles))
+    )
+
+
+# credal set of all pmfs between lower and upper probability bounds
+@dataclass
+class ProbabilityIntervals:
+    lower: PMF
+    upper: PMF
+
+    # the probability bounds are bounds on the variables of the program
+    @cached_property
+    def program(self) -> CredalProgram:
+        return pmf_program(
+            bounds=np.column_stack(
+                [np.maximum(self.lower, 0), np.asarray(self.upper, dtype=float)]
+            )
+        )
+
+    # every constraint written out, as a dense matrix: for small outcome spaces
+    @cached_property
+    def constraints(self) -> ConstraintCredalSet:
+        n = len(self.lower)
+        return ConstraintCredalSet(
+            a=np.vstack([np.eye(n), -np.eye(n)]).tolist(),
+            b=np.concatenate([self.lower, np.negative(self.upper)]).tolist(),
+        )
+
+
+def intervals_lower_expectations(
+    credal_set: ProbabilityIntervals,
+    gambles: Gambles,
+) -> Array:
+    lower = np.asarray(credal_set.lower, dtype=float)
+    upper = np.asarray(credal_set.upper, dtype=float)
+    slack = 1 - lower.sum()
+    if slack < -TOL or upper.sum() < 1 - TOL or np.any(lower > upper + TOL):
+        raise ValueError("credal set is empty")
+    xss = dense_matrix(gambles).reshape(-1, len(lower))
+    # put the remaining mass on the outcomes with the lowest values first
+    order = np.argsort(xss, axis=1)
+    capacity = (upper - lower)[order]
+    filled = np.cumsum(capacity, axis=1) - capacity
+    extra = np.clip(slack - filled, 0, capacity)
+    return xss @ lower + np.sum(np.take_along_axis(xss, order, axis=1) * extra, axis=1)
+
+
+# linear-vacuous mixture, or epsilon-contamination, of a pmf:
+# all (1 - epsilon) * pmf + epsilon * q for arbitrary pmfs q
+@dataclass
+class LinearVacuous:
+    pmf: PMF
+    epsilon: float
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.epsilon <= 1:
+            raise ValueError("epsilon must be between 0 and 1")
+
+    @cached_property
+    def program(self) -> CredalProgram:
+        lower = (1 - self.epsilon) * np.asarray(self.pmf, dtype=float)
+        return pmf_program(bounds=np.column_stack([lower, np.full(len(lower), np.inf)]))
+
+    # every constraint written out, as a dense matrix: for small outcome spaces
+    @cached_property
+    def constraints(self) -> ConstraintCredalSet:
+        n = len(self.pmf)
+        return ConstraintCredalSet(
+            a=np.eye(n).tolist(),
+            b=((1 - self.epsilon) * np.asarray(self.pmf, dtype=float)).tolist(),
+        )
+
+
+def linear_vacuous_lower_expectations(
+    credal_set: LinearVacuous,
+    gambles: Gambles,
+) -> Array:
+    epsilon = credal_set.epsilon
+    pmf = np.asarray(credal_set.pmf, dtype=float)
+    if is_sparse(gambles):
+        # only the non-zero entries are visited
+        xss = sparse.csr_array(gambles)
+        minima = dense_matrix(xss.min(axis=1)).ravel()
+        return (1 - epsilon) * np.asarray(xss @ pmf).ravel() + epsilon * minima
+    xss = np.asarray(gambles, dtype=float).reshape(-1, len(pmf))
+    return (1 - epsilon) * (xss @ pmf) + epsilon * xss.min(axis=1, initial=np.inf)
+
+
+# gambles over the cumulative distribution function c of a pmf p, with
+# p[j] = c[j] - c[j - 1], so that p @ x == c @ (x[j] - x[j + 1]) for x[k] = 0
+def cdf_gambles(xss: Array) -> Array:
+    return xss - np.pad(xss[:, 1:], ((0, 0), (0, 1)))
+
+
+# p-box on ordered outcomes: all pmfs whose cumulative distribution function
+# lies between lower_cdf and upper_cdf
+@dataclass
+class PBox:
+    lower_cdf: Sequence[float]
+    upper_cdf: Sequence[float]
+
+    # the variables are the cumulative distribution function c, so the cdf
+    # bounds are bounds on the variables; c must be nondecreasing, and end at one
+    @cached_property
+    def program(self) -> CredalProgram:
+        k = len(self.lower_cdf)
+        steps = np.arange(k - 1)
+        return CredalProgram(
+            a_ub=entries_matrix(
+                (k - 1, k),
+                rows=np.concatenate([steps, steps]),
+                columns=np.concatenate([steps, steps + 1]),
+                values=np.concatenate([np.ones(k - 1), -np.ones(k - 1)]),
+            ),
+            b_ub=np.zeros(k - 1),
+            a_eq=cdf_gambles(np.ones((1, k))),
+            b_eq=np.ones(1),
+            bounds=np.column_stack(
+                [np.maximum(self.lower_cdf, 0), np.asarray(self.upper_cdf, dtype=float)]
+            ),
+            to_variables=cdf_gambles,
+        )
+
+    # every constraint written out, as a dense matrix: for small outcome spaces
+    @cached_property
+    def constraints(self) -> ConstraintCredalSet:
+        n = len(self.lower_cdf)
+        cumulative = np.tril(np.ones((n, n)))
+        return ConstraintCredalSet(
+            a=np.vstack([cumulative, -cumulative]).tolist(),
+            b=np.concatenate([self.lower_cdf, np.negative(self.upper_cdf)]).tolist(),
+        )
+
+
+# minimum of xss[:, start:stop + 1] for every range, with a sparse table
+# of minima over windows whose length is a power of two
+def range_minimum(xss: Array, starts: IntArray, stops: IntArray) -> Array:
+    levels = np.frexp(stops - starts + 1)[1] - 1
+    result = np.empty((len(xss), len(starts)))
+    table = xss
+    for level in range(int(levels.max(initial=-1)) + 1):
+        if level > 0:
+            width = 2 ** (level - 1)
+            table = np.minimum(table[:, :-width], table[:, width:])
+        (queries,) = np.nonzero(levels == level)
+        result[:, queries] = np.minimum(
+            table[:, starts[queries]], table[:, stops[queries] - 2**level + 1]
+        )
+    return result
+
+
+# the p-box is a random set whose focal sets are the intervals
+# [upper_cdf^-1(alpha), lower_cdf^-1(alpha)] for alpha in (0, 1],
+# so the lower expectation is the average of the gamble's minimum over those
+def pbox_lower_expectations(credal_set: PBox, gambles: Gambles) -> Array:
+    # tighten the bounds to nondecreasing ones; the credal set does not change
+    lower_cdf = np.maximum.accumulate(np.asarray(credal_set.lower_cdf, dtype=float))
+    upper_cdf = np.minimum.accumulate(
+        np.asarray(credal_set.upper_cdf, dtype=float)[::-1]
+    )[::-1]
+    if np.any(lower_cdf > upper_cdf + TOL) or lower_cdf[-1] < 1 - TOL:
+        raise ValueError("credal set is empty")
+    xss = dense_matrix(gambles).reshape(-1, len(lower_cdf))
+    alphas = np.unique(np.concatenate([[0], lower_cdf[:-1], upper_cdf[:-1], [1]]))
+    alphas = alphas[(alphas >= 0) & (alphas <= 1)]
+    starts = np.searchsorted(upper_cdf, alphas[1:] - TOL)
+    stops = np.searchsorted(lower_cdf, alphas[1:] - TOL)
+    return range_minimum(xss, starts, np.minimum(stops, len(lower_cdf) - 1)) @ np.diff(
+        alphas
+    )
+
+
+# for a set of likelihoods: the credal set over (likelihood, outcome) pairs,
+# whose members are mixtures of members of credal_set paired with each likelihood
+@dataclass
+class JointCredalSet:
+    credal_set: CredalSet
+    num_likelihoods: int
+
+    @cached_property
+    def program(self) -> CredalProgram:
+        return joint_program(credal_program(self.credal_set), self.num_likelihoods)
+
+
+# the lowest lower expectation over the likelihoods, as the joint credal set
+# mixes over them
+def joint_lower_expectations(credal_set: JointCredalSet, gambles: Gambles) -> Array:
+    xss = dense_matrix(gambles)
+    n, num_likelihoods = len(xss), credal_set.num_likelihoods
+    values = lower_expectations(
+        credal_set.credal_set,
+        xss.reshape(n * num_likelihoods, xss.shape[1] // num_likelihoods),
+    )
+    return values.reshape(n, num_likelihoods).min(axis=1, initial=np.inf)
+
+
+# kron(eye(num_likelihoods), [matrix | -b]), with the columns of -b moved to
+# the end: matrix @ z <= b becomes matrix @ z[l] - b * weights[l] <= 0
+def likelihood_blocks(
+    matrix: Array | SparseMatrix, b: Array, num_likelihoods: int
+) -> Array | SparseMatrix:
+    m, v = matrix.shape
+    rows, columns, values = matrix_entries(matrix)
+    (b_rows,) = np.nonzero(b)
+    shifts = np.arange(num_likelihoods)[:, np.newaxis]
+    return entries_matrix(
+        (num_likelihoods * m, num_likelihoods * (v + 1)),
+        rows=np.concatenate(
+            [(rows + m * shifts).ravel(), (b_rows + m * shifts).ravel()]
+        ),
+        columns=np.concatenate(
+            [
+                (columns + v * shifts).ravel(),
+                np.repeat(v * num_likelihoods + shifts.ravel(), len(b_rows)),
+            ]
+        ),
+        values=np.concatenate(
+            [np.tile(values, num_likelihoods), np.tile(-b[b_rows], num_likelihoods)]
+        ),
+    )
+
+
+def joint_gambles(
+    to_variables: Callable[[Array], Array], num_likelihoods: int, xss: Array
+) -> Array:
+    n = len(xss)
+    yss = to_variables(
+        xss.reshape(n * num_likelihoods, xss.shape[1] // num_likelihoods)
+    )
+    return np.hstack(
+        [yss.reshape(n, num_likelihoods * yss.shape[1]), np.zeros((n, num_likelihoods))]
+    )
+
+
+# program of the joint credal set: the variables are z[l] = weights[l] * z for
+# every likelihood l and variables z of the program, followed by the weights,
+# which sum to one; the lower bounds of z must be non-negative
+def joint_program(program: CredalProgram, num_likelihoods: int) -> CredalProgram:
+    v = len(program.bounds)
+    lower, upper = program.bounds.T
+    # bounds other than z[l] >= 0 become constraints, as they scale with weights[l]
+    (has_lower,) = np.nonzero(lower)
+    (has_upper,) = np.nonzero(np.isfinite(upper))
+    a_ub = stack_rows(
+        [
+            likelihood_blocks(program.a_ub, program.b_ub, num_likelihoods),
+            likelihood_blocks(
+                entries_matrix(
+                    (len(has_lower), v),
+                    np.arange(len(has_lower)),
+                    has_lower,
+                    -np.ones(len(has_lower)),
+                ),
+                -lower[has_lower],
+                num_likelihoods,
+            ),
+            likelihood_blocks(
+                entries_matrix(
+                    (len(has_upper), v),
+                    np.arange(len(has_upper)),
+                    has_upper,
+                    np.ones(len(has_upper)),
+                ),
+                upper[has_upper],
+                num_likelihoods,
+            ),
+        ]
+    )
+    likelihoods = np.arange(num_likelihoods)
+    a_eq = stack_rows(
+        [
+            likelihood_blocks(program.a_eq, program.b_eq, num_likelihoods),
+            entries_matrix(
+                (1, num_likelihoods * (v + 1)),
+                np.zeros(num_likelihoods, dtype=int),
+                v * num_likelihoods + likelihoods,
+                np.ones(num_likelihoods),
+            ),
+        ]
+    )
+    return CredalProgram(
+        a_ub=a_ub,
+        b_ub=np.zeros(a_ub.shape[0]),
+        a_eq=a_eq,
+        b_eq=np.append(np.zeros(a_eq.shape[0] - 1), 1),
+        bounds=np.tile([0, np.inf], (num_likelihoods * (v + 1), 1)),
+        to_variables=partial(joint_gambles, program.to_variables, num_likelihoods),
+    )
+
+
+# credal sets that are given by constraints rather than by a finite sequence
+# of pmfs; a new type of credal set only needs to be added here
+CONSTRAINT_CREDAL_SETS = (
+    ConstraintCredalSet,
+    ProbabilityIntervals,
+    LinearVacuous,
+    PBox,
+    JointCredalSet,
+)
+
+
+def credal_program(credal_set: CredalSet) -> CredalProgram:
+    if isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        return credal_set.program
+    return mixture_program(credal_set)
+
+
+def test_probability_intervals(lp_solver: str) -> None:
+    credal_set = ProbabilityIntervals(lower=[0.5, 0.2], upper=[0.8, 0.5])
+    pmfs = [[0.5, 0.5], [0.8, 0.2]]
+    gambles = [[440, 260], [420, 300], [370, 370]]
+    assert lower_expectations(credal_set, gambles) == pytest.approx([350, 360, 370])
+    assert upper_expectations(credal_set, gambles) == pytest.approx([404, 396, 370])
+    assert is_hurwicz_2(0.5, credal_set, gambles) == is_hurwicz(0.5, pmfs, gambles)
+    assert is_interval_maximal_4(credal_set, gambles) == [True, True, True]
+    assert is_rbayes_maximal_3(credal_set, gambles) == [True, True, True]
+    assert is_rbayes_admissible_2(credal_set, gambles) == [True, True, True]
+    with pytest.raises(ValueError, match="empty"):
+        lower_expectations(ProbabilityIntervals([0.6, 0.6], [1, 1]), gambles)
+    with pytest.raises(ValueError, match="empty"):
+        lower_expectations(ProbabilityIntervals([0.5, 0.3], [0.4, 0.9]), [[1, 2]])
+
+
+def test_linear_vacuous(lp_solver: str) -> None:
+    credal_set = LinearVacuous(pmf=[0.2, 0.3, 0.5], epsilon=0.1)
+    # the extreme points mix the pmf with degenerate pmfs
+    pmfs = (0.9 * np.array([0.2, 0.3, 0.5]) + 0.1 * np.eye(3)).tolist()
+    gambles = [[3, 9, 2], [4, 4, 4], [0, 3, 6], [6, 2, 1]]
+    assert lower_expectations(credal_set, gambles) == pytest.approx(
+        lower_expectations(pmfs, gambles)
+    )
+    assert upper_expectations(credal_set, gambles) == pytest.approx(
+        upper_expectations(pmfs, gambles)
+    )
+    assert is_gamma_maximin_2(credal_set, gambles) == is_gamma_maximin(pmfs, gambles)
+    assert is_interval_maximal_5(credal_set, gambles) == is_interval_maximal_2(
+        pmfs, gambles
+    )
+    assert is_rbayes_maximal_4(credal_set, gambles) == is_rbayes_maximal(pmfs, gambles)
+    assert is_rbayes_admissible_2(credal_set, gambles) == is_e_admissible(pmfs, gambles)
+    for epsilon in [-0.1, 1.5]:
+        with pytest.raises(ValueError, match="epsilon"):
+            LinearVacuous(pmf=[0.2, 0.3, 0.5], epsilon=epsilon)
+
+
+def test_pbox(lp_solver: str) -> None:
+    credal_set = PBox(lower_cdf=[0.1, 0.4, 1], upper_cdf=[0.3, 0.8, 1])
+    # vertices of the p-box
+    pmfs = [[0.1, 0.3, 0.6], [0.1, 0.7, 0.2], [0.3, 0.1, 0.6], [0.3, 0.5, 0.2]]
+    gambles = [[3, 9, 2], [4, 4, 4], [0, 3, 6], [6, 2, 1], [1, -5, 1]]
+    assert lower_expectations(credal_set, gambles) == pytest.approx(
+        lower_expectations(pmfs, gambles)
+    )
+    assert upper_expectations(credal_set, gambles) == pytest.approx(
+        upper_expectations(pmfs, gambles)
+    )
+    assert is_rbayes_admissible_2(credal_set, gambles) == is_e_admissible(pmfs, gambles)
+    with pytest.raises(ValueError, match="empty"):
+        lower_expectations(PBox([0.5, 1], [0.4, 1]), gambles)
+
+
+def test_closed_form_random(lp_solver: str) -> None:
+    rng = np.random.default_rng(0)
+    for n in [1, 2, 5, 13]:
+        gambles = rng.normal(size=(20, n)).tolist()
+        pmf = rng.dirichlet(np.ones(n))
+        lower = rng.uniform(0.5, 1, size=n) * pmf
+        upper = np.minimum(1, rng.uniform(1, 1.5, size=n) * pmf)
+        intervals = ProbabilityIntervals(lower.tolist(), upper.tolist())
+        vacuous = LinearVacuous(pmf.tolist(), 0.2)
+        cdf = np.cumsum(pmf)
+        lower_cdf = np.maximum(0, cdf - rng.uniform(0, 0.2, size=n))
+        upper_cdf = np.minimum(1, cdf + rng.uniform(0, 0.2, size=n))
+        lower_cdf[-1] = 1
+        pbox = PBox(lower_cdf.tolist(), upper_cdf.tolist())
+        credal_sets: list[ProbabilityIntervals | LinearVacuous | PBox] = [
+            intervals,
+            vacuous,
+            pbox,
+        ]
+        for credal_set in credal_sets:
+            assert lower_expectations(credal_set, gambles) == pytest.approx(
+                lower_expectations(credal_set.constraints, gambles)
+            )
+            assert upper_expectations(credal_set, gambles) == pytest.approx(
+                upper_expectations(credal_set.constraints, gambles)
+            )
+            assert is_e_admissible(credal_set, gambles) == is_e_admissible(
+                credal_set.constraints, gambles
+            )
+
+
+def test_closed_form_large() -> None:
+    rng = np.random.default_rng(0)
+    n = 100_000
+    pmf = rng.dirichlet(np.ones(n))
+    gambles = rng.normal(size=(5, n)).tolist()
+    vacuous = LinearVacuous(pmf.tolist(), 0.3)
+    intervals = ProbabilityIntervals((0.7 * pmf).tolist(), (0.7 * pmf + 0.3).tolist())
+    lower_cdf = 0.7 * np.cumsum(pmf)
+    lower_cdf[-1] = 1
+    pbox = PBox(lower_cdf.tolist(), np.minimum(1, lower_cdf + 0.3).tolist())
+    assert lower_expectations(intervals, gambles) == pytest.approx(
+        lower_expectations(vacuous, gambles)
+    )
+    assert upper_expectations(intervals, gambles) == pytest.approx(
+        upper_expectations(vacuous, gambles)
+    )
+    # the p-box contains the linear-vacuous credal set
+    assert np.all(
+        lower_expectations(pbox, gambles) <= lower_expectations(vacuous, gambles) + TOL
+    )
+    assert is_gamma_maximin_2(vacuous, gambles) == is_gamma_maximin_2(
+        intervals, gambles
+    )
+
+
+@pytest.mark.skipif(linprog is None, reason="scipy is not installed")
+def test_closed_form_large_e_admissible() -> None:
+    rng = np.random.default_rng(0)
+    n = 100_000
+    pmf = rng.dirichlet(np.ones(n))
+    gambles = rng.normal(size=(5, n))
+    # maximal, but worse than a mixture of two others; and dominated
+    gambles[3] = (gambles[1] + gambles[2]) / 2 - 0.01
+    gambles[4] = gambles[0] - 0.01
+    # the same credal set twice: the lower probabilities leave a mass of 0.3
+    vacuous = LinearVacuous(pmf.tolist(), 0.3)
+    intervals = ProbabilityIntervals((0.7 * pmf).tolist(), (0.7 * pmf + 0.3).tolist())
+    expected = [True, True, True, False, False]
+    assert is_rbayes_maximal_3(vacuous, gambles) == [True, True, True, True, False]
+    assert is_rbayes_admissible_2(vacuous, gambles) == expected
+    assert is_rbayes_admissible_2(intervals, gambles) == expected
+    # the p-box needs a constraint for every outcome, so it is kept smaller
+    m = 10_000
+    lower_cdf = 0.7 * np.cumsum(pmf[:m]) / pmf[:m].sum()
+    lower_cdf[-1] = 1
+    pbox = PBox(lower_cdf.tolist(), np.minimum(1, lower_cdf + 0.3).tolist())
+    assert is_rbayes_admissible_2(pbox, gambles[:, :m]) == expected
+
+
+@pytest.mark.skipif(sparse is None, reason="scipy is not installed")
+def test_sparse() -> None:
+    gambles = sparse_matrix(4, [([0, 1], [3, 9]), ([], []), ([1, 3], [-2, 5])])
+    assert gambles.toarray().tolist() == [[3, 9, 0, 0], [0, 0, 0, 0], [0, -2, 0, 5]]
+    credal_set = [[0.4, 0.5, 0.1, 0], [0.1, 0.7, 0.1, 0.1], [0.6, 0.2, 0, 0.2]]
+    dense_gambles = gambles.toarray().tolist()
+    pmfs = sparse.csr_array(credal_set)
+    assert expectation_matrix(credal_set, gambles) == pytest.approx(
+        expectation_matrix(credal_set, dense_gambles)
+    )
+    assert expectation_matrix(pmfs, gambles) == pytest.approx(
+        expectation_matrix(credal_set, dense_gambles)
+    )
+    assert lower_expectations(pmfs, gambles[[2]]) == pytest.approx([-1])
+    assert upper_expectations(credal_set, gambles[[0]]) == pytest.approx([6.6])
+    assert hurwicz_expectations(0.5, credal_set, gambles[[0]]) == pytest.approx([5.1])
+    criteria: list[Callable[[CredalSet, Gambles], Sequence[bool]]] = [
+        is_gamma_maximin_2,
+        is_gamma_maximax_2,
+        is_interval_maximal_4,
+        is_interval_maximal_5,
+        is_rbayes_maximal_3,
+        is_rbayes_maximal_4,
+        is_rbayes_admissible_2,
+        is_e_admissible,
+    ]
+    credal_sets: list[CredalSet] = [
+        pmfs,
+        LinearVacuous(pmf=credal_set[0], epsilon=0.2),
+        ProbabilityIntervals(lower=[0.1, 0.2, 0, 0], upper=[0.6, 0.7, 0.1, 0.2]),
+        PBox(lower_cdf=[0.1, 0.5, 0.6, 1], upper_cdf=[0.6, 0.8, 0.8, 1]),
+    ]
+    for credal_set_2 in credal_sets:
+        assert lower_expectations(credal_set_2, gambles) == pytest.approx(
+            lower_expectations(credal_set_2, dense_gambles)
+        )
+        assert upper_expectations(credal_set_2, gambles) == pytest.approx(
+            upper_expectations(credal_set_2, dense_gambles)
+        )
+        for criterion in criteria:
+            assert criterion(credal_set_2, gambles) == criterion(
+                credal_set_2, dense_gambles
+            )
+
+
+@pytest.mark.skipif(sparse is None, reason="scipy is not installed")
+def test_sparse_large() -> None:
+    rng = np.random.default_rng(0)
+    n = 50_000
+    # indicator-like gambles, with a handful of non-zero payoffs
+    gambles = sparse_matrix(
+        n,
+        [
+            (
+                rng.choice(n, size=5, replace=False).tolist(),
+                rng.uniform(0, 10, size=5).tolist(),
+            )
+            for _ in range(2000)
+        ],
+    )
+    credal_set = sparse.random_array(
+        (10, n), density=0.01, random_state=rng, format="csr"
+    )
+    credal_set = credal_set / credal_set.sum(axis=1)[:, np.newaxis]
+    expectations = expectation_matrix(credal_set, gambles)
+    assert expectations.shape == (2000, 10)
+    assert expectations[:20] == pytest.approx(
+        gambles[:20].toarray() @ credal_set.toarray().T
+    )
+    assert is_gamma_maximin_2(credal_set, gambles) == is_gamma_maxi_values(
+        expectations.min(axis=1)
+    )
+    vacuous = LinearVacuous(pmf=np.full(n, 1 / n).tolist(), epsilon=0.5)
+    assert lower_expectations(vacuous, gambles[:20]) == pytest.approx(
+        lower_expectations(vacuous, gambles[:20].toarray())
+    )
+
+
+# write chunks of gambles to a .npy file, and return it memory-mapped;
+# float32 storage halves the size, at the cost of precision
+def save_gambles(
+    path: str | os.PathLike[str],
+    shape: tuple[int, int],
+    chunks: Iterable[npt.ArrayLike],
+    dtype: npt.DTypeLike = np.float64,
+) -> FloatArray:
+    gambles = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    start = 0
+    for chunk in chunks:
+        values = np.asarray(chunk)
+        gambles[start : start + len(values)] = values
+        start += len(values)
+    if start != shape[0]:
+        raise ValueError(f"expected {shape[0]} gambles but got {start}")
+    gambles.flush()
+    return gambles
+
+
+def gamble_chunks(
+    gambles: FloatArray,
+    chunk_size: int,
+) -> Iterator[tuple[IntArray, Array]]:
+    # yields gamble indices along with the gambles, as float64
+    for start in range(0, len(gambles), chunk_size):
+        stop = min(start + chunk_size, len(gambles))
+        yield np.arange(start, stop), np.asarray(gambles[start:stop], dtype=float)
+
+
+# one pass, keeping only the lower expectations in memory
+def is_gamma_maximin_chunked(
+    credal_set: CredalSet,
+    gambles: FloatArray,
+    chunk_size: int = 65536,
+) -> BoolArray:
+    lowers = np.empty(len(gambles))
+    for indices, xss in gamble_chunks(gambles, chunk_size):
+        lowers[indices] = lower_expectations(credal_set, xss)
+    return lowers + TOL >= lowers.max()
+
+
+# one pass, keeping only the upper expectations in memory
+def is_interval_maximal_chunked(
+    credal_set: CredalSet,
+    gambles: FloatArray,
+    chunk_size: int = 65536,
+) -> BoolArray:
+    maxmin = -np.inf
+    uppers = np.empty(len(gambles))
+    for indices, xss in gamble_chunks(gambles, chunk_size):
+        bounds = lower_upper_expectations(credal_set, xss)
+        maxmin = max(maxmin, bounds.lower.max())
+        uppers[indices] = bounds.upper
+    return uppers + TOL >= maxmin
+
+
+# two passes: the maximal expectation for every pmf, then the gambles
+def is_rbayes_admissible_chunked(
+    credal_set: Sequence[PMF] | FloatArray | SparseMatrix,
+    gambles: FloatArray,
+    chunk_size: int = 65536,
+) -> BoolArray:
+    maxs: Array | None = None
+    for _, xss in gamble_chunks(gambles, chunk_size):
+        chunk_maxs = expectation_matrix(credal_set, xss).max(axis=0)
+        maxs = chunk_maxs if maxs is None else np.maximum(maxs, chunk_maxs)
+    result = np.zeros(len(gambles), dtype=bool)
+    if maxs is None:
+        return result
+    for indices, xss in gamble_chunks(gambles, chunk_size):
+        ess = expectation_matrix(credal_set, xss)
+        result[indices] = np.any(ess + TOL >= maxs, axis=1)
+    return result
+
+
+# two passes: the skyline of the expectation vectors, then the gambles;
+# by transitivity, a dominated gamble is dominated by a skyline vector
+def is_rbayes_maximal_chunked(
+    credal_set: Sequence[PMF] | FloatArray | SparseMatrix,
+    gambles: FloatArray,
+    chunk_size: int = 65536,
+) -> BoolArray:
+    skyline: Array | None = None
+    for _, xss in gamble_chunks(gambles, chunk_size):
+        ess = expectation_matrix(credal_set, xss)
+        if skyline is not None:
+            ess = np.vstack([skyline, ess[~is_pointwise_dominated(skyline, ess)]])
+        skyline = ess[pointwise_maximal(ess)]
+    result = np.zeros(len(gambles), dtype=bool)
+    if skyline is None:
+        return result
+    for indices, xss in gamble_chunks(gambles, chunk_size):
+        ess = expectation_matrix(credal_set, xss)
+        result[indices] = ~is_pointwise_dominated(skyline, ess)
+    return result
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_chunked(tmp_path: Any, dtype: npt.DTypeLike) -> None:
+    rng = np.random.default_rng(0)
+    gambles = save_gambles(
+        tmp_path / "gambles.npy",
+        (1000, 4),
+        (rng.normal(size=(n, 4)) for n in [300, 300, 400]),
+        dtype=dtype,
+    )
+    assert gambles.dtype == dtype
+    gambles = np.load(tmp_path / "gambles.npy", mmap_mode="r")
+    np.save(tmp_path / "credal_set.npy", rng.dirichlet(np.ones(4), size=3))
+    credal_set = np.load(tmp_path / "credal_set.npy", mmap_mode="r")
+    # in memory evaluation of the same, possibly rounded, values
+    xss = np.asarray(gambles, dtype=float).tolist()
+    pmfs = credal_set.tolist()
+    for chunk_size in [1, 64, 1000, 5000]:
+        assert is_gamma_maximin_chunked(
+            credal_set, gambles, chunk_size
+        ).tolist() == is_gamma_maximin(pmfs, xss)
+        assert is_interval_maximal_chunked(
+            credal_set, gambles, chunk_size
+        ).tolist() == is_interval_maximal_2(pmfs, xss)
+        assert is_rbayes_admissible_chunked(
+            credal_set, gambles, chunk_size
+        ).tolist() == is_rbayes_admissible(pmfs, xss)
+        assert is_rbayes_maximal_chunked(
+            credal_set, gambles, chunk_size
+        ).tolist() == is_rbayes_maximal_3(pmfs, xss)
+    vacuous = LinearVacuous(pmf=pmfs[0], epsilon=0.1)
+    assert is_gamma_maximin_chunked(vacuous, gambles, 64).tolist() == (
+        is_gamma_maximin_2(vacuous, xss)
+    )
+    assert is_interval_maximal_chunked(vacuous, gambles, 64).tolist() == (
+        is_interval_maximal_5(vacuous, xss)
+    )
+    with pytest.raises(ValueError, match="expected 10 gambles"):
+        save_gambles(tmp_path / "bad.npy", (10, 4), [np.zeros((5, 4))])
+
+
 def test_extra() -> None:
     gambles = [[3, 9, 2], [4, 4, 4], [0, 3, 6], [6, 2, 1]]
     credal_set = [[0.4, 0.5, 0.1], [0.1, 0.8, 0.1], [0.6, 0.2, 0.2]]
@@ -330,3 +2482,804 @@ def test_extra_2() -> None:
     assert is_rbayes_maximal(pmfs, rvars) == [True, True, True, False, True, False]
     assert is_rbayes_maximal_2(pmfs, rvars) == [True, True, True, False, True, False]
     assert is_rbayes_admissible(pmfs, rvars) == [True, True, True, False, False, False]
+
+
+# expectations, bounds, and choice sets are calculated on first use only,
+# and shared by all reports on the same problem
+@dataclass
+class DecisionProblem:
+    credal_set: Sequence[PMF] | FloatArray | SparseMatrix
+    gambles: Gambles
+
+    @cached_property
+    def expectations(self) -> Array:
+        return expectation_matrix(self.credal_set, self.gambles)
+
+    @cached_property
+    def lower(self) -> Array:
+        return self.expectations.min(axis=1)
+
+    @cached_property
+    def upper(self) -> Array:
+        return self.expectations.max(axis=1)
+
+    @cached_property
+    def interval_maximal(self) -> BoolArray:
+        return self.upper + TOL >= self.lower.max(initial=-np.inf)
+
+    @cached_property
+    def rbayes_maximal(self) -> BoolArray:
+        return pointwise_maximal(self.expectations)
+
+    # the union of the bayes choice sets of the pmfs
+    @cached_property
+    def rbayes_admissible(self) -> BoolArray:
+        xss = self.expectations
+        return (xss + TOL >= xss.max(axis=0)).any(axis=1)
+
+
+class DecisionReport(NamedTuple):
+    gamma_maximin: Sequence[bool]
+    gamma_maximax: Sequence[bool]
+    hurwicz: Sequence[bool]
+    interval_maximal: Sequence[bool]
+    rbayes_maximal: Sequence[bool]
+    rbayes_admissible: Sequence[bool]
+
+
+# only the hurwicz choice set depends on beta
+def decision_report(problem: DecisionProblem, beta: float) -> DecisionReport:
+    return DecisionReport(
+        gamma_maximin=is_gamma_maxi_values(problem.lower),
+        gamma_maximax=is_gamma_maxi_values(problem.upper),
+        hurwicz=is_gamma_maxi_values(beta * problem.lower + (1 - beta) * problem.upper),
+        interval_maximal=problem.interval_maximal.tolist(),
+        rbayes_maximal=problem.rbayes_maximal.tolist(),
+        rbayes_admissible=problem.rbayes_admissible.tolist(),
+    )
+
+
+def test_decision_report() -> None:
+    gambles = [[3, 9, 2], [4, 4, 4], [0, 3, 6], [6, 2, 1]]
+    credal_set = [[0.4, 0.5, 0.1], [0.1, 0.8, 0.1], [0.6, 0.2, 0.2]]
+    problem = DecisionProblem(credal_set, gambles)
+    assert decision_report(problem, 0.5) == DecisionReport(
+        gamma_maximin=is_gamma_maximin(credal_set, gambles),
+        gamma_maximax=is_gamma_maximax(credal_set, gambles),
+        hurwicz=is_hurwicz(0.5, credal_set, gambles),
+        interval_maximal=is_interval_maximal(credal_set, gambles),
+        rbayes_maximal=is_rbayes_maximal(credal_set, gambles),
+        rbayes_admissible=is_rbayes_admissible(credal_set, gambles),
+    )
+    # the choice sets are reused across reports
+    choice_sets = [problem.interval_maximal, problem.rbayes_maximal]
+    assert decision_report(problem, 0.2).rbayes_admissible == [True, False, False, True]
+    assert problem.interval_maximal is choice_sets[0]
+    assert problem.rbayes_maximal is choice_sets[1]
+
+
+def test_decision_report_2() -> None:
+    pmfs: Sequence[Sequence[float]] = [[0.28, 0.72], [0.5, 0.5], [0.7, 0.3]]
+    rvars: Sequence[Sequence[float]] = [
+        [4, 0],
+        [0, 4],
+        [3, 2],
+        [0.5, 3],
+        [2.35, 2.35],
+        [4.1, -0.3],
+    ]
+    report = decision_report(DecisionProblem(pmfs, rvars), 0.5)
+    assert report.interval_maximal == [True, True, True, False, True, True]
+    assert report.rbayes_maximal == [True, True, True, False, True, False]
+    assert report.hurwicz == is_hurwicz(0.5, pmfs, rvars)
+
+
+# random problems for stress tests and benchmarks
+class RandomProblem(NamedTuple):
+    credal_set: Array
+    gambles: Array
+
+
+def random_problem(
+    seed: int | Sequence[int] | np.random.Generator,
+    num_gambles: int,
+    num_pmfs: int,
+    num_outcomes: int,
+    # dirichlet concentration, large values give pmfs close to uniform
+    concentration: float = 1.0,
+    # fraction of gambles that are pointwise dominated by another gamble
+    dominated: float = 0.0,
+    # round the gambles, to create ties
+    decimals: int | None = None,
+) -> RandomProblem:
+    rng = np.random.default_rng(seed)
+    credal_set = rng.dirichlet(np.full(num_outcomes, concentration), size=num_pmfs)
+    gambles = rng.normal(size=(num_gambles, num_outcomes))
+    num_dominated = min(round(dominated * num_gambles), max(num_gambles - 1, 0))
+    if num_dominated:
+        indices = rng.permutation(num_gambles)
+        targets = indices[:num_dominated]
+        sources = rng.choice(indices[num_dominated:], size=num_dominated)
+        shifts = rng.uniform(0.1, 1, size=(num_dominated, num_outcomes))
+        gambles[targets] = gambles[sources] - shifts
+    if decimals is not None:
+        gambles = np.round(gambles, decimals)
+    return RandomProblem(credal_set, gambles)
+
+
+def test_random_problem() -> None:
+    credal_set, gambles = random_problem(0, 100, 5, 3, dominated=0.3, decimals=1)
+    assert credal_set.shape == (5, 3)
+    assert gambles.shape == (100, 3)
+    assert credal_set.sum(axis=1) == pytest.approx(np.ones(5))
+    assert np.all(gambles == np.round(gambles, 1))
+    assert sum(is_rbayes_maximal_3(credal_set, gambles)) <= 70
+    assert np.array_equal(
+        random_problem(0, 100, 5, 3).gambles, random_problem(0, 100, 5, 3).gambles
+    )
+    assert random_problem(0, 1, 1, 2, dominated=1).gambles.shape == (1, 2)
+
+
+def test_benchmark_results(tmp_path: Any) -> None:
+    # the benchmark script imports this module, so only import it here
+    from benchmark_02_robust_decision_making import (
+        BenchmarkResult,
+        load_results,
+        regressions,
+        save_results,
+    )
+
+    baseline = [
+        BenchmarkResult("is_gamma_maximin_2", 100, 2, 2, 0.01, 1 << 20),
+        BenchmarkResult("is_rbayes_maximal_3", 100, 2, 2, 1e-4, 1000),
+    ]
+    results = [
+        # twice as slow, and four times the memory
+        BenchmarkResult("is_gamma_maximin_2", 100, 2, 2, 0.02, 1 << 22),
+        # five times worse, but within min_seconds and min_bytes
+        BenchmarkResult("is_rbayes_maximal_3", 100, 2, 2, 5e-4, 5000),
+        # not in the baseline
+        BenchmarkResult("is_rbayes_admissible_2", 100, 2, 2, 1.0, 1 << 30),
+    ]
+    for path, benchmark_results in [("baseline.json", baseline), ("new.json", results)]:
+        save_results(str(tmp_path / path), benchmark_results)
+    assert load_results(str(tmp_path / "baseline.json")) == baseline
+    assert load_results(str(tmp_path / "new.json")) == results
+    assert regressions(load_results(str(tmp_path / "new.json")), baseline) == [
+        "is_gamma_maximin_2 n=100 k=2 m=2: 0.01s -> 0.02s",
+        "is_gamma_maximin_2 n=100 k=2 m=2: 1048576 bytes -> 4194304 bytes",
+    ]
+    assert regressions(results, baseline, threshold=3) == [
+        "is_gamma_maximin_2 n=100 k=2 m=2: 1048576 bytes -> 4194304 bytes",
+    ]
+    assert regressions(results, baseline, min_seconds=1e-5, min_bytes=1000) == [
+        "is_gamma_maximin_2 n=100 k=2 m=2: 0.01s -> 0.02s",
+        "is_gamma_maximin_2 n=100 k=2 m=2: 1048576 bytes -> 4194304 bytes",
+        "is_rbayes_maximal_3 n=100 k=2 m=2: 0.0001s -> 0.0005s",
+        "is_rbayes_maximal_3 n=100 k=2 m=2: 1000 bytes -> 5000 bytes",
+    ]
+
+
+# the random problems are passed as lists, as for the notebook criteria
+Criterion = Callable[[Sequence[PMF], Sequence[Gamble]], Sequence[bool]]
+
+
+class Mismatch(NamedTuple):
+    # seed of the random generator that produced the problem
+    seed: Sequence[int]
+    name: str
+    problem: RandomProblem
+    expected: Sequence[bool]
+    actual: Sequence[bool]
+
+
+# implementations that must agree with the first one, on every problem
+DIFFERENTIAL_CHECKS: dict[str, Sequence[Criterion]] = {
+    "is_interval_maximal": [
+        is_interval_maximal,
+        is_interval_maximal_2,
+        is_interval_maximal_3,
+        is_interval_maximal_4,
+    ],
+    "is_rbayes_maximal": [
+        is_rbayes_maximal,
+        is_rbayes_maximal_2,
+        is_rbayes_maximal_3,
+        is_rbayes_maximal_4,
+    ],
+}
+
+
+# compare implementations on many small random problems,
+# with exact ties, near ties, and dominated gambles
+def differential_test(
+    num_problems: int,
+    seed: int | Sequence[int] = 0,
+    max_gambles: int = 8,
+    max_pmfs: int = 4,
+    max_outcomes: int = 4,
+    checks: Mapping[str, Sequence[Criterion]] = DIFFERENTIAL_CHECKS,
+) -> Iterator[Mismatch]:
+    seeds = [seed] if isinstance(seed, int) else list(seed)
+    for index in range(num_problems):
+        problem_seed = [*seeds, index]
+        rng = np.random.default_rng(problem_seed)
+        credal_set, gambles = random_problem(
+            rng,
+            num_gambles=int(rng.integers(1, max_gambles + 1)),
+            num_pmfs=int(rng.integers(1, max_pmfs + 1)),
+            num_outcomes=int(rng.integers(1, max_outcomes + 1)),
+            dominated=rng.uniform(0, 0.5),
+            decimals=[None, 0, 1][rng.integers(3)],
+        )
+        if rng.integers(2):
+            gambles += rng.integers(-1, 2, size=gambles.shape) * TOL
+        pmfs = credal_set.tolist()
+        rvars = gambles.tolist()
+        for name, (reference, *candidates) in checks.items():
+            expected = list(reference(pmfs, rvars))
+            for candidate in candidates:
+                actual = list(candidate(pmfs, rvars))
+                if actual != expected:
+                    yield Mismatch(
+                        problem_seed,
+                        name,
+                        RandomProblem(credal_set, gambles),
+                        expected,
+                        actual,
+                    )
+
+
+def test_differential() -> None:
+    assert list(differential_test(500)) == []
+    # an implementation of a different criterion is caught
+    checks = {"wrong": [is_interval_maximal, is_gamma_maximin]}
+    mismatches = list(differential_test(50, checks=checks))
+    assert mismatches
+    mismatch, *_ = mismatches
+    assert mismatch.name == "wrong"
+    pmfs, rvars = (
+        mismatch.problem.credal_set.tolist(),
+        mismatch.problem.gambles.tolist(),
+    )
+    assert mismatch.expected == is_interval_maximal(pmfs, rvars)
+    assert mismatch.actual == is_gamma_maximin(pmfs, rvars)
+
+
+# choice sets of a finite credal set that is edited one pmf at a time, for n
+# gambles, k pmfs, and m robust bayes maximal gambles; once the expectations
+# under the edited pmf are known, the bounds and the interval maximal set
+# are updated in O(n) per edit, except for rescanning, in O(k) each, the
+# gambles whose bound was attained by a removed pmf; the robust bayes maximal
+# set is repaired by pointwise comparisons, in O((n - m) * m * k) per added
+# pmf, and O(m ** 2 * k) per removed pmf
+@dataclass
+class IncrementalDecisionProblem:
+    gambles: Array
+    pmfs: list[PMF] = field(default_factory=list)
+    # expectations[:, j] are the expectations under pmfs[j], with spare columns
+    buffer: Array = field(init=False)
+    lower: Array = field(init=False)
+    upper: Array = field(init=False)
+    # pmfs that attain the lower and upper expectations
+    lower_index: IntArray = field(init=False)
+    upper_index: IntArray = field(init=False)
+    rbayes_maximal: BoolArray = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.gambles = np.asarray(self.gambles, dtype=float)
+        n = len(self.gambles)
+        pmfs = self.pmfs
+        self.pmfs = []
+        self.buffer = np.empty((n, max(len(pmfs), 4)))
+        self.lower = np.full(n, np.inf)
+        self.upper = np.full(n, -np.inf)
+        self.lower_index = np.zeros(n, dtype=int)
+        self.upper_index = np.zeros(n, dtype=int)
+        # without pmfs, every gamble dominates every gamble
+        self.rbayes_maximal = np.zeros(n, dtype=bool)
+        for pmf in pmfs:
+            self.add_pmf(pmf)
+
+    @property
+    def expectations(self) -> Array:
+        return self.buffer[:, : len(self.pmfs)]
+
+    @property
+    def interval_maximal(self) -> BoolArray:
+        return self.upper + TOL >= self.lower.max(initial=-np.inf)
+
+    def add_pmf(self, pmf: PMF) -> None:
+        k = len(self.pmfs)
+        if k == self.buffer.shape[1]:
+            buffer = np.empty((len(self.gambles), 2 * k))
+            buffer[:, :k] = self.buffer
+            self.buffer = buffer
+        xs = self.gambles @ np.asarray(pmf, dtype=float)
+        self.buffer[:, k] = xs
+        self.pmfs.append(pmf)
+        is_lower = xs < self.lower
+        self.lower[is_lower] = xs[is_lower]
+        self.lower_index[is_lower] = k
+        is_upper = xs > self.upper
+        self.upper[is_upper] = xs[is_upper]
+        self.upper_index[is_upper] = k
+        # maximal gambles stay maximal, dominated gambles can only be
+        # dominated by maximal gambles, or by dominated gambles that are no
+        # longer dominated; O((n - m) * m * k) for the former, and
+        # O(c ** 2 * k) for the c gambles that are left for the latter
+        xss = self.expectations
+        maximal = self.rbayes_maximal
+        candidates = np.flatnonzero(~maximal)
+        is_dominated = is_pointwise_dominated(xss[maximal], xss[candidates])
+        candidates = candidates[~is_dominated]
+        is_dominated = is_pointwise_dominated(xss[candidates], xss[candidates])
+        self.rbayes_maximal[candidates[~is_dominated]] = True
+
+    # remove pmfs[index], which is replaced by the last pmf
+    def remove_pmf(self, index: int) -> PMF:
+        pmf = self.pmfs[index]
+        last = len(self.pmfs) - 1
+        self.buffer[:, index] = self.buffer[:, last]
+        self.pmfs[index] = self.pmfs[last]
+        self.pmfs.pop()
+        if not self.pmfs:
+            self.lower[:] = np.inf
+            self.upper[:] = -np.inf
+        # only the gambles whose bound was attained by the removed pmf
+        # need to be rescanned
+        for bounds, indices, argbound in [
+            (self.lower, self.lower_index, np.argmin),
+            (self.upper, self.upper_index, np.argmax),
+        ]:
+            stale = np.flatnonzero(indices == index)
+            indices[indices == last] = index
+            if self.pmfs:
+                xss = self.expectations[stale]
+                indices[stale] = argbound(xss, axis=1)
+                bounds[stale] = xss[np.arange(len(stale)), indices[stale]]
+        # dominated gambles stay dominated, and a maximal gamble that is now
+        # dominated is also dominated by a gamble that was maximal; O(m ** 2 * k)
+        maximal = np.flatnonzero(self.rbayes_maximal)
+        xss = self.expectations[maximal]
+        self.rbayes_maximal[maximal] = ~is_pointwise_dominated(xss, xss)
+        return pmf
+
+
+def test_incremental_decision_problem() -> None:
+    rng = np.random.default_rng(0)
+    for n, m in [(0, 2), (1, 1), (5, 2), (50, 3), (300, 4)]:
+        pmfs, gambles = random_problem(rng, n, 3, m, dominated=0.3, decimals=1)
+        problem = IncrementalDecisionProblem(gambles, pmfs.tolist())
+        for _ in range(40):
+            if problem.pmfs and rng.integers(2):
+                problem.remove_pmf(int(rng.integers(len(problem.pmfs))))
+            elif problem.pmfs and rng.integers(3) == 0:
+                # duplicate pmfs give ties
+                problem.add_pmf(problem.pmfs[rng.integers(len(problem.pmfs))])
+            else:
+                problem.add_pmf(rng.dirichlet(np.ones(m)).tolist())
+            xss = problem.expectations
+            assert xss.shape == (n, len(problem.pmfs))
+            pmfs = np.reshape(problem.pmfs, (-1, m))
+            assert xss == pytest.approx(gambles @ pmfs.T)
+            assert np.array_equal(problem.lower, xss.min(axis=1, initial=np.inf))
+            assert np.array_equal(problem.upper, xss.max(axis=1, initial=-np.inf))
+            assert problem.interval_maximal.tolist() == [
+                not any(lower > upper + TOL for lower in problem.lower)
+                for upper in problem.upper
+            ]
+            assert problem.rbayes_maximal.tolist() == is_maximal(
+                pointwise_dominates, xss.tolist()
+            )
+    problem = IncrementalDecisionProblem(
+        np.array([[440, 260], [420, 300], [370, 370]]), [[0.5, 0.5]]
+    )
+    assert problem.rbayes_maximal.tolist() == [False, False, True]
+    problem.add_pmf([0.8, 0.2])
+    assert problem.rbayes_maximal.tolist() == [True, True, True]
+    assert problem.remove_pmf(0) == [0.5, 0.5]
+    assert problem.pmfs == [[0.8, 0.2]]
+    assert problem.rbayes_maximal.tolist() == [True, False, False]
+    assert problem.lower.tolist() == pytest.approx([404, 396, 370])
+
+
+class PosteriorCredalSets(NamedTuple):
+    # pmfs[y, j, x] is the posterior of x given y, for prior j
+    pmfs: Array
+    # evidence[y, j] is the probability of y, for prior j; posteriors for
+    # priors without evidence are zero, and must be left out
+    evidence: Array
+
+
+# condition every prior on every data value at once
+def posterior_credal_sets(
+    credal_set: Sequence[PMF] | Array,
+    likelihood_table: npt.ArrayLike,  # likelihood_table[y, x]
+) -> PosteriorCredalSets:
+    priors = np.asarray(credal_set, dtype=float)
+    likelihoods = np.asarray(likelihood_table, dtype=float)
+    joint = likelihoods[:, np.newaxis, :] * priors[np.newaxis, :, :]
+    evidence = joint.sum(axis=2)
+    pmfs = np.divide(
+        joint,
+        evidence[:, :, np.newaxis],
+        out=np.zeros_like(joint),
+        where=evidence[:, :, np.newaxis] > 0,
+    )
+    return PosteriorCredalSets(pmfs, evidence)
+
+
+# generalized bayes rule: result[y, i] is the largest mu for which the lower
+# expectation of likelihood_table[y] * (gambles[i] - mu) is non-negative,
+# found by bisection for all y and i together, with one batch of lower
+# expectations per step; this is nan if y has zero upper probability
+def gbr_lower_expectations(
+    credal_set: CredalSet,
+    likelihood_table: npt.ArrayLike,
+    gambles: Gambles,
+    tol: float = 1e-9,
+) -> Array:
+    likelihoods = np.asarray(likelihood_table, dtype=float)
+    xss = dense_matrix(gambles)
+    lo = np.broadcast_to(xss.min(axis=1, initial=np.inf), (len(likelihoods), len(xss)))
+    hi = np.broadcast_to(xss.max(axis=1, initial=-np.inf), lo.shape)
+    while np.any(hi - lo > tol):
+        mu = (lo + hi) / 2
+        yss = likelihoods[:, np.newaxis, :] * (xss - mu[:, :, np.newaxis])
+        values = lower_expectations(credal_set, yss.reshape(-1, xss.shape[1]))
+        is_feasible = values.reshape(mu.shape) >= 0
+        lo = np.where(is_feasible, mu, lo)
+        hi = np.where(is_feasible, hi, mu)
+    upper_evidence = upper_expectations(credal_set, likelihoods)
+    return np.where(upper_evidence[:, np.newaxis] > 0, lo, np.nan)
+
+
+# result[y, i] is the lower expectation of gambles[i] given y,
+# by regular extension
+def conditional_lower_expectations(
+    credal_set: CredalSet,
+    likelihood_table: npt.ArrayLike,  # likelihood_table[y, x]
+    gambles: Gambles,
+) -> Array:
+    if isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        return gbr_lower_expectations(credal_set, likelihood_table, gambles)
+    # without materialising the posteriors: numerators[y, i, j] is the
+    # expectation of gambles[i] given y under prior j, times the evidence
+    priors = dense_matrix(credal_set)
+    likelihoods = np.asarray(likelihood_table, dtype=float)
+    joint = likelihoods[:, np.newaxis, :] * priors[np.newaxis, :, :]
+    numerators = dense_matrix(gambles) @ joint.transpose(0, 2, 1)
+    evidence = joint.sum(axis=2)[:, np.newaxis, :]
+    values = np.divide(
+        numerators,
+        evidence,
+        out=np.full_like(numerators, np.inf),
+        where=evidence > 0,
+    ).min(axis=2, initial=np.inf)
+    return np.where(np.isinf(values), np.nan, values)
+
+
+def conditional_upper_expectations(
+    credal_set: CredalSet,
+    likelihood_table: npt.ArrayLike,
+    gambles: Gambles,
+) -> Array:
+    return -conditional_lower_expectations(
+        credal_set, likelihood_table, -as_matrix(gambles)
+    )
+
+
+def test_posterior_credal_sets() -> None:
+    priors: Sequence[Sequence[float]] = [[0.2, 0.3, 0.5], [0.6, 0.4, 0], [0, 0, 1]]
+    likelihood_table: Sequence[Sequence[float]] = [[0.9, 0.5, 0], [0.1, 0.5, 1]]
+    pmfs, evidence = posterior_credal_sets(priors, likelihood_table)
+    assert evidence == pytest.approx(np.array([[0.33, 0.74, 0], [0.67, 0.26, 1]]))
+    assert pmfs[0].tolist() == [
+        pytest.approx([0.18 / 0.33, 0.15 / 0.33, 0]),
+        pytest.approx([0.54 / 0.74, 0.2 / 0.74, 0]),
+        [0, 0, 0],
+    ]
+    assert pmfs[1, 2].tolist() == [0, 0, 1]
+    gambles = [[1, 2, 3], [4, 0, -1]]
+    # minimum over the posteriors of priors with evidence
+    assert conditional_lower_expectations(
+        priors, likelihood_table, gambles
+    ).tolist() == [
+        [
+            pytest.approx(min((0.18 + 0.3) / 0.33, (0.54 + 0.4) / 0.74)),
+            pytest.approx(min(0.72 / 0.33, 2.16 / 0.74)),
+        ],
+        [pytest.approx(min(1.82 / 0.67, 0.46 / 0.26, 3)), -1],
+    ]
+    # posterior credal sets can be used with every other criterion
+    for y in range(2):
+        posterior = pmfs[y][evidence[y] > 0].tolist()
+        assert lower_expectations(posterior, gambles) == pytest.approx(
+            conditional_lower_expectations(priors, likelihood_table, gambles)[y]
+        )
+    # zero upper probability
+    assert np.isnan(conditional_lower_expectations(priors, [[0, 0, 0]], gambles)).all()
+
+
+def test_gbr_lower_expectations(lp_solver: str) -> None:
+    rng = np.random.default_rng(0)
+    pmf = [0.2, 0.3, 0.5]
+    credal_set = LinearVacuous(pmf, 0.2)
+    # the extreme points of a linear vacuous credal set
+    vertices = 0.8 * np.array(pmf) + 0.2 * np.eye(3)
+    likelihood_table: Sequence[Sequence[float]] = [
+        [0.9, 0.5, 0],
+        [0.1, 0.5, 1],
+        [0, 0, 0],
+    ]
+    gambles = rng.normal(size=(5, 3))
+    result = conditional_lower_expectations(credal_set, likelihood_table, gambles)
+    expected = conditional_lower_expectations(vertices, likelihood_table, gambles)
+    assert result[:2] == pytest.approx(expected[:2], abs=1e-8)
+    assert np.isnan(result[2]).all() and np.isnan(expected[2]).all()
+    assert conditional_upper_expectations(
+        credal_set.constraints, likelihood_table[:2], gambles
+    ) == pytest.approx(
+        conditional_upper_expectations(vertices, likelihood_table[:2], gambles),
+        abs=1e-8,
+    )
+    # one extreme point has no evidence for the first data value
+    credal_set = LinearVacuous([0, 0, 1], 0.5)
+    vertices = 0.5 * np.array([0, 0, 1]) + 0.5 * np.eye(3)
+    assert conditional_lower_expectations(
+        credal_set, likelihood_table[:2], gambles
+    ) == pytest.approx(
+        conditional_lower_expectations(vertices, likelihood_table[:2], gambles),
+        abs=1e-8,
+    )
+
+
+# for a set of likelihoods: the credal set over (likelihood, parameter) pairs,
+# whose members are mixtures of priors paired with each likelihood; finite
+# credal sets stay finite, so that the pmf-based criteria still apply
+def joint_credal_set(credal_set: CredalSet, num_likelihoods: int) -> CredalSet:
+    if isinstance(credal_set, CONSTRAINT_CREDAL_SETS):
+        return JointCredalSet(credal_set, num_likelihoods)
+    if is_sparse(credal_set):
+        return sparse.kron(sparse.eye(num_likelihoods), credal_set, format="csr")
+    return np.kron(np.eye(num_likelihoods), np.asarray(credal_set, dtype=float))
+
+
+class StrategyReport(NamedTuple):
+    gamma_maximin: BoolArray
+    gamma_maximax: BoolArray
+    interval_maximal: BoolArray
+    rbayes_maximal: BoolArray
+    e_admissible: BoolArray
+
+
+# every choice set among strategies, from their risk matrix, with
+# risk[s, x] the wald expected utility of strategy s given parameter x,
+# or risk[l, s, x] the same for every likelihood l in a set of likelihoods
+def robust_strategy_report(
+    credal_set: CredalSet, risk: npt.ArrayLike
+) -> StrategyReport:
+    xss = np.asarray(risk, dtype=float)
+    if xss.ndim == 3:
+        credal_set = joint_credal_set(credal_set, len(xss))
+        xss = xss.transpose(1, 0, 2).reshape(xss.shape[1], -1)
+    lower, upper = lower_upper_expectations(credal_set, xss)
+    interval_maximal = upper + TOL >= lower.max(initial=-np.inf)
+    # every choice set below is a subset of the previous one, and the
+    # strategies that were left out cannot affect the result
+    (candidates,) = np.nonzero(interval_maximal)
+    rbayes_maximal = np.zeros(len(xss), dtype=bool)
+    rbayes_maximal[candidates] = is_rbayes_maximal_3(credal_set, xss[candidates])
+    (candidates,) = np.nonzero(rbayes_maximal)
+    e_admissible = np.zeros(len(xss), dtype=bool)
+    e_admissible[candidates] = is_e_admissible(credal_set, xss[candidates])
+    return StrategyReport(
+        gamma_maximin=lower + TOL >= lower.max(initial=-np.inf),
+        gamma_maximax=upper + TOL >= upper.max(initial=-np.inf),
+        interval_maximal=interval_maximal,
+        rbayes_maximal=rbayes_maximal,
+        e_admissible=e_admissible,
+    )
+
+
+# risk[l, s, x] for every strategy s, with likelihood_tables[l, y, x]
+def strategy_risks(utility_table: Array, likelihood_tables: Array) -> Array:
+    num_decisions, num_data = len(utility_table), likelihood_tables.shape[1]
+    # strategies[s, y] is the decision of strategy s given y; as in notebook 01,
+    # strategies are numbered in base num_decisions, least significant digit first
+    codes = np.arange(num_decisions**num_data)
+    strategies = np.empty((len(codes), num_data), dtype=int)
+    for y in range(num_data):
+        codes, strategies[:, y] = np.divmod(codes, num_decisions)
+    return np.einsum("syx,lyx->lsx", utility_table[strategies], likelihood_tables)
+
+
+def test_robust_strategy_report(lp_solver: str) -> None:
+    rng = np.random.default_rng(0)
+    utility_table = rng.normal(size=(3, 3))
+    likelihood_tables = rng.dirichlet(np.ones(4), size=(2, 3)).transpose(0, 2, 1)
+    risk = strategy_risks(utility_table, likelihood_tables)
+    assert risk.shape == (2, 81, 3)
+    # strategy 1 takes decision 1 for the first data point, and decision 0 otherwise
+    assert risk[:, 1] == pytest.approx(
+        np.einsum("yx,lyx->lx", utility_table[[1, 0, 0, 0]], likelihood_tables)
+    )
+    priors = rng.dirichlet(np.ones(3), size=3)
+    report = robust_strategy_report(priors, risk[0])
+    pmfs, rvars = priors.tolist(), risk[0].tolist()
+    assert report.gamma_maximin.tolist() == is_gamma_maximin(pmfs, rvars)
+    assert report.gamma_maximax.tolist() == is_gamma_maximax(pmfs, rvars)
+    assert report.interval_maximal.tolist() == is_interval_maximal(pmfs, rvars)
+    assert report.rbayes_maximal.tolist() == is_rbayes_maximal(pmfs, rvars)
+    assert report.e_admissible.tolist() == is_e_admissible(priors, risk[0])
+    assert any(report.e_admissible)
+    # a set of likelihoods: the same as all pairs of priors and likelihoods
+    report = robust_strategy_report(priors, risk)
+    values = np.einsum("jx,lsx->slj", priors, risk).reshape(81, -1)
+    assert report.gamma_maximin.tolist() == is_gamma_maxi_values(values.min(axis=1))
+    assert report.rbayes_maximal.tolist() == is_maximal(
+        pointwise_dominates, values.tolist()
+    )
+    # credal sets given by constraints, and their extreme points
+    pbox = PBox(lower_cdf=[0.1, 0.4, 1], upper_cdf=[0.3, 0.8, 1])
+    pbox_vertices = [[0.1, 0.3, 0.6], [0.1, 0.7, 0.2], [0.3, 0.1, 0.6], [0.3, 0.5, 0.2]]
+    credal_sets: list[tuple[CredalSet, CredalSet]] = [
+        (LinearVacuous(priors[0].tolist(), 0.3), 0.7 * priors[0] + 0.3 * np.eye(3)),
+        (pbox, pbox_vertices),
+        (pbox.constraints, pbox_vertices),
+    ]
+    for credal_set, vertices in credal_sets:
+        for xss in [risk[0][::4], risk[:, ::4]]:
+            assert all(
+                np.array_equal(choices, expected)
+                for choices, expected in zip(
+                    robust_strategy_report(credal_set, xss),
+                    robust_strategy_report(vertices, xss),
+                )
+            )
+
+
+def test_robust_strategy_report_large() -> None:
+    rng = np.random.default_rng(0)
+    utility_table = rng.normal(size=(4, 3))
+    likelihood_tables = rng.dirichlet(np.ones(7), size=(2, 3)).transpose(0, 2, 1)
+    risk = strategy_risks(utility_table, likelihood_tables)
+    assert risk.shape == (2, 16384, 3)
+    report = robust_strategy_report(rng.dirichlet(np.ones(3), size=5), risk)
+    assert not np.any(report.e_admissible & ~report.rbayes_maximal)
+    assert not np.any(report.rbayes_maximal & ~report.interval_maximal)
+    assert not np.any(report.gamma_maximin & ~report.interval_maximal)
+    assert np.any(report.e_admissible)
+
+
+# many small independent problems, padded to the same size;
+# padded pmfs and gambles are ignored, padded outcomes must be zero
+class ProblemBatch(NamedTuple):
+    credal_sets: Array  # credal_sets[b, j, x]
+    gambles: Array  # gambles[b, i, x]
+    num_pmfs: IntArray  # num_pmfs[b]
+    num_gambles: IntArray  # num_gambles[b]
+
+
+def problem_batch(
+    problems: Sequence[tuple[Sequence[PMF] | Array, Sequence[Gamble] | Array]],
+) -> ProblemBatch:
+    credal_sets = [np.asarray(credal_set, dtype=float) for credal_set, _ in problems]
+    gambless = [np.asarray(gambles, dtype=float) for _, gambles in problems]
+    num_pmfs = np.array([len(credal_set) for credal_set in credal_sets], dtype=int)
+    num_gambles = np.array([len(gambles) for gambles in gambless], dtype=int)
+    num_outcomes = max(
+        (xss.shape[1] for xss in credal_sets + gambless if xss.ndim == 2), default=0
+    )
+    batch = ProblemBatch(
+        credal_sets=np.zeros((len(problems), num_pmfs.max(initial=0), num_outcomes)),
+        gambles=np.zeros((len(problems), num_gambles.max(initial=0), num_outcomes)),
+        num_pmfs=num_pmfs,
+        num_gambles=num_gambles,
+    )
+    for b, (credal_set, gambles) in enumerate(zip(credal_sets, gambless)):
+        batch.credal_sets[b, : len(credal_set), : credal_set.shape[-1]] = credal_set
+        batch.gambles[b, : len(gambles), : gambles.shape[-1]] = gambles
+    return batch
+
+
+class BatchDecisionReport(NamedTuple):
+    # [b, i] is True whenever gamble i is chosen in problem b
+    gamma_maximin: BoolArray
+    gamma_maximax: BoolArray
+    hurwicz: BoolArray
+    interval_maximal: BoolArray
+    rbayes_maximal: BoolArray
+    rbayes_admissible: BoolArray
+
+
+# same as decision_report for every problem, in one vectorised pass
+def batch_decision_report(batch: ProblemBatch, beta: float) -> BatchDecisionReport:
+    num_problems, n, k = (
+        len(batch.gambles),
+        batch.gambles.shape[1],
+        batch.credal_sets.shape[1],
+    )
+    is_pmf = np.arange(k) < batch.num_pmfs[:, np.newaxis]
+    # problems without pmfs choose nothing
+    is_gamble = (np.arange(n) < batch.num_gambles[:, np.newaxis]) & (
+        batch.num_pmfs[:, np.newaxis] > 0
+    )
+    # xss[b, i, j] is the expectation of gamble i under pmf j in problem b
+    xss = batch.gambles @ batch.credal_sets.transpose(0, 2, 1)
+    lower = np.where(is_pmf[:, np.newaxis, :], xss, np.inf).min(axis=2, initial=np.inf)
+    upper = np.where(is_pmf[:, np.newaxis, :], xss, -np.inf).max(
+        axis=2, initial=-np.inf
+    )
+    bounds = ExpectationBounds(
+        lower=np.where(is_gamble, lower, 0), upper=np.where(is_gamble, upper, 0)
+    )
+
+    # padded gambles never attain the maximum
+    def is_gamma_maxi_batch(values: Array) -> BoolArray:
+        values = np.where(is_gamble, values, -np.inf)
+        return is_gamble & (
+            values + TOL >= values.max(axis=1, keepdims=True, initial=-np.inf)
+        )
+
+    max_lower = np.where(is_gamble, bounds.lower, -np.inf).max(
+        axis=1, keepdims=True, initial=-np.inf
+    )
+    # dominates[b, i, l] is True whenever gamble i robust bayes dominates
+    # gamble l in problem b; padded pmfs do not constrain dominance
+    dominates = np.ones((num_problems, n, n), dtype=bool)
+    for j in range(k):
+        dominates &= (
+            xss[:, :, np.newaxis, j] > xss[:, np.newaxis, :, j] + TOL
+        ) | ~is_pmf[:, np.newaxis, np.newaxis, j]
+    dominates &= is_gamble[:, :, np.newaxis]
+    maxs = np.where(is_gamble[:, :, np.newaxis], xss, -np.inf).max(
+        axis=1, keepdims=True, initial=-np.inf
+    )
+    return BatchDecisionReport(
+        gamma_maximin=is_gamma_maxi_batch(bounds.lower),
+        gamma_maximax=is_gamma_maxi_batch(bounds.upper),
+        hurwicz=is_gamma_maxi_batch(bounds.hurwicz(beta)),
+        interval_maximal=is_gamble & (bounds.upper + TOL >= max_lower),
+        rbayes_maximal=is_gamble & ~dominates.any(axis=1),
+        rbayes_admissible=is_gamble
+        & ((xss + TOL >= maxs) & is_pmf[:, np.newaxis, :]).any(axis=2),
+    )
+
+
+def test_batch_decision_report() -> None:
+    rng = np.random.default_rng(0)
+    problems = [
+        random_problem(
+            rng,
+            num_gambles=int(rng.integers(1, 8)),
+            num_pmfs=int(rng.integers(1, 5)),
+            num_outcomes=int(rng.integers(1, 5)),
+            dominated=0.3,
+            decimals=1,
+        )
+        for _ in range(300)
+    ]
+    batch = problem_batch(problems)
+    assert batch.credal_sets.shape == (300, 4, 4)
+    assert batch.gambles.shape == (300, 7, 4)
+    for beta in [0, 0.3, 1]:
+        report = batch_decision_report(batch, beta)
+        for b, (credal_set, gambles) in enumerate(problems):
+            n = len(gambles)
+            expected = decision_report(DecisionProblem(credal_set, gambles), beta)
+            for choices, expected_choices in zip(report, expected):
+                assert choices[b, :n].tolist() == expected_choices
+                assert not np.any(choices[b, n:])
+    # problems without gambles, or without pmfs
+    report = batch_decision_report(
+        problem_batch([([[0.5, 0.5]], []), ([], [[1, 2]]), ([[1]], [[1], [2]])]), 0.5
+    )
+    assert report.gamma_maximin.tolist() == [
+        [False, False],
+        [False, False],
+        [False, True],
+    ]
+    assert report.rbayes_maximal.tolist() == report.gamma_maximin.tolist()
+    assert problem_batch([]).gambles.shape == (0, 0, 0)